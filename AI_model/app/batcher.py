@@ -0,0 +1,139 @@
+# app/batcher.py
+import asyncio
+import logging
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into batches.
+
+    The first waiting row opens a batch; rows arriving within `max_wait`
+    seconds join it, up to `max_batch` rows, and the batch is run as one
+    forward pass in a worker thread so the event loop keeps accepting
+    requests. One batch runs at a time: the next one fills while the
+    current one computes, which is where the batching under load comes
+    from.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[np.ndarray], np.ndarray],
+        max_batch: int,
+        max_wait: float,
+        max_queue: int,
+    ):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.rows = 0
+        self.batches = 0
+        self.rejected = 0
+        self.largest_batch = 0
+        self.last_batch_ms = 0.0
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Nobody will answer what is still queued
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def submit(self, row: List[float]) -> np.ndarray:
+        if self._task is None or self._task.done():
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((row, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull()
+        return await future
+
+    async def _collect(self) -> List[Tuple[list, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            # Take whatever is already queued without waiting
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (client disconnected) don't need a row
+            batch = [(row, future) for row, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                outputs = await asyncio.to_thread(
+                    self.predict, np.asarray([row for row, _ in batch], dtype=np.float32)
+                )
+            except Exception as e:
+                logger.exception("batch prediction failed", extra={"rows": len(batch)})
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.last_batch_ms = (time.perf_counter() - start) * 1000
+            self.batches += 1
+            self.rows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "rows": self.rows,
+            "batches": self.batches,
+            "avg_batch": round(self.rows / self.batches, 2) if self.batches else 0,
+            "largest_batch": self.largest_batch,
+            "rejected": self.rejected,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+        }
@@ -0,0 +1,24 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Settings:
+    APP_NAME = "Accesco Monthly Budget AI"
+
+    MODEL_PATH = os.getenv("BUDGET_MODEL_PATH", os.path.join(BASE_DIR, "monthly_budget_model.keras"))
+    # "numpy" serves the export_model.py .npz without importing TensorFlow;
+    # "keras" loads MODEL_PATH itself
+    MODEL_BACKEND = os.getenv("BUDGET_MODEL_BACKEND", "numpy")
+    EXPORT_PATH = os.getenv("BUDGET_EXPORT_PATH", os.path.join(BASE_DIR, "monthly_budget_model.npz"))
+    TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+
+    # Micro-batching: concurrent /predict calls are answered by one forward
+    # pass of up to PREDICT_MAX_BATCH rows, waiting at most
+    # PREDICT_MAX_WAIT_MS after the first row for others to join
+    PREDICT_MAX_BATCH = int(os.getenv("PREDICT_MAX_BATCH", "64"))
+    PREDICT_MAX_WAIT_MS = float(os.getenv("PREDICT_MAX_WAIT_MS", "2"))
+    PREDICT_MAX_QUEUE = int(os.getenv("PREDICT_MAX_QUEUE", "10000"))
+
+
+settings = Settings()
@@ -0,0 +1,100 @@
+# app/export.py
+"""
+Converts the Keras budget model into a plain .npz of its Dense layers so
+serving needs NumPy only: no TensorFlow import, no h5py.
+
+A .keras file is a zip of config.json (the layer graph) and
+model.weights.h5, where Keras 3 stores each Dense layer's kernel and bias
+under layers/<name>/vars/0 and /1, the names being dense, dense_1, ...
+in model order.
+"""
+import hashlib
+import io
+import json
+import zipfile
+from typing import List, Tuple
+
+import numpy as np
+
+# Activations the NumPy forward pass implements
+ACTIVATIONS = ("relu", "linear")
+
+Layer = Tuple[np.ndarray, np.ndarray, str]
+
+
+def sha256_of(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_keras(path: str) -> List[Layer]:
+    """Returns [(kernel, bias, activation)] for a Sequential model of Dense layers."""
+    import h5py
+
+    with zipfile.ZipFile(path) as archive:
+        config = json.loads(archive.read("config.json"))
+        weights = h5py.File(io.BytesIO(archive.read("model.weights.h5")), "r")
+
+    if config.get("class_name") != "Sequential":
+        raise ValueError(f"expected a Sequential model, got {config.get('class_name')}")
+
+    layers = []
+    with weights:
+        for spec in config["config"]["layers"]:
+            kind = spec["class_name"]
+            if kind == "InputLayer":
+                continue
+            if kind != "Dense":
+                raise ValueError(f"unsupported layer {kind}")
+            activation = spec["config"]["activation"]
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"unsupported activation {activation}")
+
+            name = "dense" if not layers else f"dense_{len(layers)}"
+            kernel = weights[f"layers/{name}/vars/0"][()].astype(np.float32)
+            if spec["config"]["use_bias"]:
+                bias = weights[f"layers/{name}/vars/1"][()].astype(np.float32)
+            else:
+                bias = np.zeros(kernel.shape[1], dtype=np.float32)
+
+            if kernel.shape[1] != spec["config"]["units"]:
+                raise ValueError(f"{name}: kernel {kernel.shape} for {spec['config']['units']} units")
+            if layers and layers[-1][0].shape[1] != kernel.shape[0]:
+                raise ValueError(f"{name}: kernel {kernel.shape} after {layers[-1][0].shape}")
+            layers.append((kernel, bias, activation))
+
+    if not layers:
+        raise ValueError("model has no Dense layers")
+    return layers
+
+
+def save_npz(layers: List[Layer], out: str, source_sha256: str = ""):
+    arrays = {"activations": np.array([activation for _, _, activation in layers])}
+    for i, (kernel, bias, _) in enumerate(layers):
+        arrays[f"kernel_{i}"] = kernel
+        arrays[f"bias_{i}"] = bias
+    np.savez(out, source_sha256=np.array(source_sha256), **arrays)
+
+
+def load_npz(path: str) -> Tuple[List[Layer], str]:
+    """Returns (layers, sha256 of the .keras file they were exported from)."""
+    with np.load(path) as data:
+        activations = [str(a) for a in data["activations"]]
+        layers = [
+            (data[f"kernel_{i}"], data[f"bias_{i}"], activation)
+            for i, activation in enumerate(activations)
+        ]
+        return layers, str(data["source_sha256"])
+
+
+def forward(layers: List[Layer], rows: np.ndarray) -> np.ndarray:
+    x = np.asarray(rows, dtype=np.float32)
+    for kernel, bias, activation in layers:
+        x = x @ kernel
+        x += bias
+        if activation == "relu":
+            np.maximum(x, 0, out=x)
+    return x
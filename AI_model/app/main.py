@@ -0,0 +1,99 @@
+# app/main.py
+"""
+Monthly Budget AI: serves templates/index.html and its /predict endpoint.
+
+Run on its own:
+    uvicorn AI_model.app.main:app
+or mount it next to the chatbot (mounted apps don't get lifespan events,
+so the model then loads on the first /predict):
+    from AI_model.app.main import app as budget_app
+    app.mount("/budget", budget_app)
+
+By default the model is served from monthly_budget_model.npz, written by
+    python -m AI_model.export_model
+(BUDGET_MODEL_BACKEND=keras loads the .keras file through TensorFlow).
+
+/predict answers {"scaled": false, "scores": {category: score}}: the
+model's raw outputs, since its training preprocessing is not part of this
+repository (see model.to_scores).
+"""
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+
+from AI_model.app.batcher import MicroBatcher, QueueFull
+from AI_model.app.config import settings
+from AI_model.app.model import KerasBudgetModel, NumpyBudgetModel, to_row, to_scores
+
+logger = logging.getLogger(__name__)
+
+if settings.MODEL_BACKEND == "keras":
+    model = KerasBudgetModel(settings.MODEL_PATH)
+else:
+    model = NumpyBudgetModel(settings.EXPORT_PATH, source_path=settings.MODEL_PATH)
+
+batcher = MicroBatcher(
+    predict=model.predict,
+    max_batch=settings.PREDICT_MAX_BATCH,
+    max_wait=settings.PREDICT_MAX_WAIT_MS / 1000,
+    max_queue=settings.PREDICT_MAX_QUEUE,
+)
+_load_lock = asyncio.Lock()
+
+
+async def ensure_model():
+    if model.loaded:
+        return
+    async with _load_lock:
+        if not model.loaded:
+            await asyncio.to_thread(model.load)
+            logger.info("budget model loaded", extra={"path": model.path, "backend": settings.MODEL_BACKEND})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ensure_model()
+    batcher.start()
+    yield
+    await batcher.stop()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+
+
+class BudgetInput(BaseModel):
+    income: float = Field(ge=0)
+    rent: float = Field(ge=0)
+    cost_index: float = Field(gt=0)
+    family_members: float = Field(ge=1)
+
+
+@app.get("/")
+def index():
+    return FileResponse(os.path.join(settings.TEMPLATES_DIR, "index.html"))
+
+
+@app.get("/accesco.png")
+def logo():
+    return FileResponse(os.path.join(settings.TEMPLATES_DIR, "accesco.png"))
+
+
+@app.post("/predict")
+async def predict(data: BudgetInput):
+    await ensure_model()
+    try:
+        outputs = await batcher.submit(to_row(data.model_dump()))
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="Too many predictions waiting, retry shortly")
+    # Unscaled model scores (see to_scores): only their proportions mean anything
+    return {"scaled": False, "scores": to_scores(outputs)}
+
+
+@app.get("/stats")
+def stats():
+    return {"model_loaded": model.loaded, "backend": settings.MODEL_BACKEND, **batcher.stats()}
@@ -0,0 +1,101 @@
+# app/model.py
+import logging
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from AI_model.app.export import forward, load_npz, sha256_of
+
+logger = logging.getLogger(__name__)
+
+# Inputs in the order the model was trained on
+FEATURES = ("income", "rent", "cost_index", "family_members")
+
+# Outputs in the order of the last Dense layer, named as the page reads them.
+# The training code is not in this repository, so this order is assumed
+# from the page, not verified against the model.
+CATEGORIES = (
+    "grocery_and_essentials",
+    "education",
+    "healthcare",
+    "transport",
+    "travel",
+    "entertainment",
+    "savings",
+)
+
+
+class KerasBudgetModel:
+    """
+    monthly_budget_model.keras (Dense 4→64→128→64→7), loaded once and run
+    on CPU. predict() takes an (n, 4) float32 array and returns (n, 7).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._model = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        if self._model is not None:
+            return
+        # CPU only, and quiet: must be set before TensorFlow is imported
+        os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+        os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+        import keras
+
+        self._model = keras.saving.load_model(self.path, compile=False)
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        return np.asarray(self._model.predict_on_batch(rows), dtype=np.float32)
+
+
+class NumpyBudgetModel:
+    """
+    The same model from its export_model.py .npz: the Dense layers as NumPy
+    matmuls, so loading takes milliseconds and never imports TensorFlow.
+    Same predict() contract as KerasBudgetModel.
+    """
+
+    def __init__(self, path: str, source_path: Optional[str] = None):
+        self.path = path
+        self.source_path = source_path
+        self._layers = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._layers is not None
+
+    def load(self):
+        if self._layers is not None:
+            return
+        layers, source_sha256 = load_npz(self.path)
+        # A retrained .keras that was never re-exported would silently keep
+        # serving the old weights
+        if self.source_path and os.path.exists(self.source_path) and sha256_of(self.source_path) != source_sha256:
+            logger.warning(
+                "budget model export is stale, re-run AI_model.export_model",
+                extra={"path": self.path, "source": self.source_path},
+            )
+        self._layers = layers
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        return forward(self._layers, rows)
+
+
+def to_row(values: Dict[str, float]) -> List[float]:
+    return [float(values[name]) for name in FEATURES]
+
+
+def to_scores(outputs: np.ndarray) -> Dict[str, float]:
+    """
+    The last layer's raw outputs per category. The training preprocessing
+    (input / output scaling) is not in this repository either, so these are
+    unscaled model scores, not rupee amounts: they grow with income and do
+    not add up to it.
+    """
+    return {name: round(float(value), 2) for name, value in zip(CATEGORIES, outputs)}
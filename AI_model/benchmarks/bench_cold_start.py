@@ -0,0 +1,75 @@
+"""
+Cold start of each budget model backend, each in a fresh interpreter:
+time to import and load the model, time to the first prediction, peak
+RSS, and a warm single-row predict() (what the batcher runs when the
+app is idle).
+
+TensorFlow may live in another environment than the app; point
+--keras-python at its interpreter. Run from the repository root:
+    python -m AI_model.benchmarks.bench_cold_start --runs 5 --keras-python /path/to/tf-venv/bin/python
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import numpy as np
+from AI_model.app.config import settings
+from AI_model.app.model import KerasBudgetModel, NumpyBudgetModel
+if sys.argv[1] == "keras":
+    model = KerasBudgetModel(settings.MODEL_PATH)
+else:
+    model = NumpyBudgetModel(settings.EXPORT_PATH)
+model.load()
+loaded = time.perf_counter()
+row = np.array([[50000, 15000, 1, 1]], dtype=np.float32)
+model.predict(row)
+first = time.perf_counter()
+n = 2000
+for _ in range(n):
+    model.predict(row)
+warm = (time.perf_counter() - first) / n
+print(json.dumps({
+    "load_s": loaded - start,
+    "first_s": first - start,
+    "warm_us": warm * 1e6,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def run(python: str, backend: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT, TF_CPP_MIN_LOG_LEVEL="3", CUDA_VISIBLE_DEVICES="-1")
+    out = subprocess.run(
+        [python, "-c", CHILD, backend], env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keras-python", default=sys.executable)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'load s':>7} {'first predict s':>16} {'peak RSS MB':>12} {'warm predict µs':>16}")
+    for backend, python in [("numpy", sys.executable), ("keras", args.keras_python)]:
+        try:
+            results = [run(python, backend) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{backend:<8} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+        print(f"{backend:<8} {median['load_s']:>7.3f} {median['first_s']:>16.3f} "
+              f"{median['rss_mb']:>12.0f} {median['warm_us']:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
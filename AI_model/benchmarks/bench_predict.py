@@ -0,0 +1,100 @@
+"""
+Budget model throughput by batch size: one forward pass over batches of
+1 to 256 rows, then /predict under concurrent load with the micro-batcher
+capped at each batch size (1 means no batching).
+
+Run from the repository root:
+    python -m AI_model.benchmarks.bench_predict --requests 4000 --concurrency 256
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+import numpy as np
+
+from AI_model.app.main import app, batcher, ensure_model, model
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def inputs(n: int, rnd: random.Random) -> list:
+    return [
+        {
+            "income": rnd.randrange(15_000, 300_000, 500),
+            "rent": rnd.randrange(0, 60_000, 500),
+            "cost_index": round(rnd.uniform(0.6, 1.6), 2),
+            "family_members": rnd.randint(1, 6),
+        }
+        for _ in range(n)
+    ]
+
+
+def forward_pass(rows: np.ndarray, repeat: int):
+    print("forward pass")
+    print(f"{'batch':>6}  {'ms/batch':>9}  {'rows/s':>10}")
+    for size in BATCH_SIZES:
+        batch = rows[:size]
+        model.predict(batch)  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            model.predict(batch)
+        per_batch = (time.perf_counter() - start) / repeat
+        print(f"{size:>6}  {per_batch * 1000:>9.3f}  {size / per_batch:>10,.0f}")
+
+
+async def endpoint(bodies: list, concurrency: int):
+    print(f"/predict, {len(bodies)} requests, {concurrency} concurrent")
+    print(f"{'max batch':>9}  {'req/s':>8}  {'p50 ms':>7}  {'p99 ms':>7}  {'avg batch':>9}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        for size in BATCH_SIZES:
+            await batcher.stop()
+            batcher.max_batch = size
+            batcher.rows = batcher.batches = 0
+            batcher.start()
+
+            sem = asyncio.Semaphore(concurrency)
+            latencies = []
+
+            async def one(body):
+                async with sem:
+                    start = time.perf_counter()
+                    r = await client.post("/predict", json=body)
+                    r.raise_for_status()
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(b) for b in bodies))
+            seconds = time.perf_counter() - start
+            latencies.sort()
+            print(f"{size:>9}  {len(bodies) / seconds:>8,.0f}  {latencies[len(latencies) // 2]:>7.2f}  "
+                  f"{latencies[int(len(latencies) * 0.99) - 1]:>7.2f}  {batcher.stats()['avg_batch']:>9}")
+    await batcher.stop()
+
+
+async def main_async(args):
+    rnd = random.Random(3)
+    start = time.perf_counter()
+    await ensure_model()
+    print(f"model load: {time.perf_counter() - start:.2f} s")
+
+    bodies = inputs(max(args.requests, max(BATCH_SIZES)), rnd)
+    rows = np.asarray([[b["income"], b["rent"], b["cost_index"], b["family_members"]] for b in bodies],
+                      dtype=np.float32)
+    forward_pass(rows, args.repeat)
+    await endpoint(bodies[:args.requests], args.concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
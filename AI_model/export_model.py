@@ -0,0 +1,123 @@
+"""
+Exports monthly_budget_model.keras to the .npz the budget app serves.
+
+Re-run after retraining; the app logs a warning when the .npz was
+exported from a different .keras file. --check compares the export against
+the Keras model on random and edge-case inputs and fails if any output
+differs by more than --rtol. It needs TensorFlow, and fails without it
+unless --allow-skip is given. A passing check also records a few inputs
+and their Keras outputs in tests/golden_budget.json, so the test suite
+checks the export without TensorFlow; commit it with the new .npz. Run
+from the repository root:
+    python -m AI_model.export_model --check
+"""
+import argparse
+import json
+import os
+import sys
+import zipfile
+
+import numpy as np
+
+from AI_model.app.config import settings
+from AI_model.app.export import forward, load_npz, read_keras, save_npz, sha256_of
+from AI_model.app.model import CATEGORIES, FEATURES
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "golden_budget.json")
+GOLDEN_ROWS = 12
+
+
+def parity_inputs(n: int) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    rows = np.column_stack([
+        rng.uniform(0, 500_000, n),
+        rng.uniform(0, 100_000, n),
+        rng.uniform(0.3, 3.0, n),
+        rng.integers(1, 12, n),
+    ])
+    edges = np.array([
+        [0, 0, 1, 1],
+        [1, 0, 0.01, 1],
+        [50_000, 15_000, 1, 1],
+        [10_000_000, 2_000_000, 5, 20],
+    ])
+    return np.vstack([rows, edges]).astype(np.float32)
+
+
+def max_relative_error(actual: np.ndarray, expected: np.ndarray) -> float:
+    # Relative to each row's largest output: near-zero categories would
+    # otherwise turn float32 summation-order noise into huge ratios
+    scale = np.maximum(np.abs(expected).max(axis=1, keepdims=True), 1.0)
+    return float((np.abs(actual - expected) / scale).max())
+
+
+def write_golden(reference, source_sha256: str, path: str):
+    """A few inputs and the Keras outputs for them, for tests/test_export.py."""
+    x = parity_inputs(GOLDEN_ROWS)
+    expected = np.asarray(reference.predict_on_batch(x), dtype=np.float32)
+    golden = {
+        "source_sha256": source_sha256,
+        "features": list(FEATURES),
+        "categories": list(CATEGORIES),
+        "inputs": x.tolist(),
+        "outputs": expected.tolist(),
+    }
+    with open(path, "w") as f:
+        json.dump(golden, f, indent=1)
+        f.write("\n")
+    print(f"wrote {path}: {len(x)} golden rows")
+
+
+def check_parity(keras_path: str, npz_path: str, rows: int, rtol: float,
+                 allow_skip: bool = False, golden_path: str = None) -> bool:
+    try:
+        import keras
+    except ImportError:
+        if allow_skip:
+            print("parity check skipped: keras/tensorflow is not installed (--allow-skip)")
+            return True
+        print("parity check failed: keras/tensorflow is not installed "
+              "(install it, or pass --allow-skip to export unchecked)", file=sys.stderr)
+        return False
+
+    reference = keras.saving.load_model(keras_path, compile=False)
+    layers, source_sha256 = load_npz(npz_path)
+    x = parity_inputs(rows)
+    expected = np.asarray(reference.predict_on_batch(x), dtype=np.float32)
+    error = max_relative_error(forward(layers, x), expected)
+    print(f"parity on {len(x)} rows: max relative error {error:.2e} (rtol {rtol:.0e})")
+    if error > rtol:
+        return False
+
+    if golden_path:
+        write_golden(reference, source_sha256, golden_path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=settings.MODEL_PATH)
+    parser.add_argument("--out", default=settings.EXPORT_PATH)
+    parser.add_argument("--check", action="store_true", help="compare against the Keras model")
+    parser.add_argument("--allow-skip", action="store_true",
+                        help="let --check pass when keras/tensorflow is not installed")
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="where a passing --check writes golden vectors")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--rtol", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    try:
+        layers = read_keras(args.model)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        parser.error(f"{args.model}: {e}")
+    save_npz(layers, args.out, source_sha256=sha256_of(args.model))
+    shape = " → ".join(str(k.shape[0]) for k, _, _ in layers) + f" → {layers[-1][0].shape[1]}"
+    print(f"wrote {args.out}: {len(layers)} Dense layers, {shape}")
+
+    if args.check and not check_parity(args.model, args.out, args.rows, args.rtol,
+                                       allow_skip=args.allow_skip, golden_path=args.golden):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
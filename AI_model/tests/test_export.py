@@ -0,0 +1,48 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from AI_model import export_model
+from AI_model.app.config import settings
+from AI_model.app.export import load_npz
+from AI_model.app.model import CATEGORIES, FEATURES, NumpyBudgetModel
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(export_model.GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+def test_golden_matches_served_export(golden):
+    # Goldens from another .keras would check nothing: re-run --check
+    _, source_sha256 = load_npz(settings.EXPORT_PATH)
+    assert golden["source_sha256"] == source_sha256
+    assert golden["features"] == list(FEATURES)
+    assert golden["categories"] == list(CATEGORIES)
+
+
+def test_numpy_model_matches_keras_outputs(golden):
+    model = NumpyBudgetModel(settings.EXPORT_PATH)
+    model.load()
+    x = np.array(golden["inputs"], dtype=np.float32)
+    expected = np.array(golden["outputs"], dtype=np.float32)
+    actual = model.predict(x)
+    assert actual.shape == expected.shape
+    assert export_model.max_relative_error(actual, expected) <= 1e-5
+
+
+def test_check_fails_without_keras(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, "keras", None)
+    argv = ["export_model", "--out", str(tmp_path / "model.npz"), "--golden", str(tmp_path / "golden.json"), "--check"]
+
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        export_model.main()
+    assert exc.value.code == 1
+
+    monkeypatch.setattr(sys, "argv", argv + ["--allow-skip"])
+    export_model.main()
+    assert not (tmp_path / "golden.json").exists()
@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from AI_model.app import main
+from AI_model.app.model import CATEGORIES
+
+# /predict for the page's default inputs, as served when this test was
+# written. Unscaled model scores: a change here means the model, the export
+# or the category order changed.
+INPUT = {"income": 50000, "rent": 15000, "cost_index": 1.0, "family_members": 1}
+EXPECTED = {
+    "grocery_and_essentials": 36385.82,
+    "education": 39877.65,
+    "healthcare": 44097.06,
+    "transport": 45918.61,
+    "travel": 45425.48,
+    "entertainment": 65996.88,
+    "savings": 42555.49,
+}
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_predict_returns_unscaled_scores(client):
+    r = client.post("/predict", json=INPUT)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["scaled"] is False
+    assert list(body["scores"]) == list(CATEGORIES)
+    for name, expected in EXPECTED.items():
+        assert body["scores"][name] == pytest.approx(expected, rel=1e-5, abs=0.02), name
+
+
+def test_predict_rejects_invalid_input(client):
+    r = client.post("/predict", json={**INPUT, "family_members": 0})
+    assert r.status_code == 422
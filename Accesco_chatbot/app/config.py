@@ -15,8 +15,87 @@ class Settings:
     # Database (Supabase / Render / Local)
     DATABASE_URL =(f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}"
     f"@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+    ASYNC_DATABASE_URL =(f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}"
+    f"@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+    DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+
+    # Connection pool
+    #   "transaction" → client pool that is safe behind PgBouncer / Supavisor
+    #   "queue"       → plain client pool (direct Postgres connection)
+    #   "null"        → no pooling, new connection per session
+    DB_POOL_MODE = os.getenv("DB_POOL_MODE", "transaction").lower()
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", str(DB_POOL_SIZE)))
+
+    # Product catalog cache (seconds, 0 disables caching)
+    PRODUCT_CACHE_TTL = int(os.getenv("PRODUCT_CACHE_TTL", "300"))
+
+    # Ingredient price index for custom dishes (seconds, 0 disables caching)
+    INGREDIENT_CACHE_TTL = int(os.getenv("INGREDIENT_CACHE_TTL", "300"))
+
+    # Product search: "memory" (trigram index over the cached catalog) or
+    # "postgres" (pg_trgm similarity, falls back to memory if unavailable)
+    PRODUCT_SEARCH_BACKEND = os.getenv("PRODUCT_SEARCH_BACKEND", "memory").lower()
+
+    # Order tracking read model (seconds an entry may be served, 0 disables)
+    ORDER_STATUS_TTL = int(os.getenv("ORDER_STATUS_TTL", "60"))
+    ORDER_STATUS_MAX_ENTRIES = int(os.getenv("ORDER_STATUS_MAX_ENTRIES", "10000"))
+
+    # Session cart storage: "postgres" (temp_cart table), "memory" or "redis"
+    CART_STORE = os.getenv("CART_STORE", "postgres").lower()
+    CART_TTL = int(os.getenv("CART_TTL", "86400"))
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Abandoned temp_cart sweeper (postgres cart store only)
+    CART_SWEEP_INTERVAL = int(os.getenv("CART_SWEEP_INTERVAL", "300"))
+    CART_SWEEP_BATCH = int(os.getenv("CART_SWEEP_BATCH", "1000"))
+    CART_SWEEP_MAX_BATCHES = int(os.getenv("CART_SWEEP_MAX_BATCHES", "50"))
+
+    # Replay the stored response when Dialogflow retries a delivery with the
+    # same responseId (seconds, 0 disables)
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "300"))
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+
+    # Write-behind buffer for non-critical inserts (cancel feedback):
+    # flushed every WRITE_BEHIND_INTERVAL seconds or WRITE_BEHIND_BATCH rows
+    WRITE_BEHIND_BATCH = int(os.getenv("WRITE_BEHIND_BATCH", "100"))
+    WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "1.0"))
+    WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+
+    # Node number (0-1023) in generated order IDs; give every worker its own.
+    # Unset: hashed from host name and pid, which two workers can share
+    ORDER_ID_NODE = int(os.environ["ORDER_ID_NODE"]) if os.getenv("ORDER_ID_NODE") else None
+
+    # Bulk order import (/admin/orders/import and Accesco_chatbot.import_orders):
+    # rows per insert transaction, and most orders accepted per HTTP call
+    ORDER_IMPORT_CHUNK = int(os.getenv("ORDER_IMPORT_CHUNK", "1000"))
+    ORDER_IMPORT_MAX = int(os.getenv("ORDER_IMPORT_MAX", "50000"))
+
+    # Webhook body parser: "fast" (msgspec, else orjson, whichever is
+    # installed) or "json" (stdlib)
+    WEBHOOK_PARSER = os.getenv("WEBHOOK_PARSER", "fast").lower()
+
+    # Most requests accepted by /webhook/batch
+    WEBHOOK_BATCH_MAX = int(os.getenv("WEBHOOK_BATCH_MAX", "100"))
+
+    # Logging
+    #   LOG_INTENT_LEVELS → per intent handler overrides, e.g.
+    #                       "track_order=DEBUG,add_item_swadisht=WARNING"
+    #   LOG_DEBUG_SAMPLE_RATE → fraction of DEBUG records kept (1.0 keeps all)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_INTENT_LEVELS = os.getenv("LOG_INTENT_LEVELS", "")
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
 
     # Security (optional, future use)
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
 
+    # X-Admin-Key for /admin. No default: the admin endpoints answer 503
+    # until it is set (and refuse the old "dev-secret" value)
+    ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
+
 settings = Settings()
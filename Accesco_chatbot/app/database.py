@@ -1,17 +1,155 @@
-from sqlalchemy import create_engine
+import asyncio
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool
 
 from Accesco_chatbot.app.config import settings
 
+
+# -----------------------------
+# Pool statistics
+# -----------------------------
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.connect_total_ms = 0.0
+            self.connect_max_ms = 0.0
+
+    def on_connect(self, ms: float):
+        with self._lock:
+            self.connects += 1
+            self.connect_total_ms += ms
+            self.connect_max_ms = max(self.connect_max_ms, ms)
+
+    def on_checkout(self, *args):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def on_invalidate(self, *args):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "connect_avg_ms": round(self.connect_total_ms / self.connects, 3) if self.connects else 0.0,
+                "connect_max_ms": round(self.connect_max_ms, 3),
+            }
+
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def _pool_kwargs(pool_mode: str) -> dict:
+    if pool_mode == "null":
+        return {"poolclass": NullPool}
+
+    if pool_mode not in ("queue", "transaction"):
+        raise ValueError(f"Unknown DB_POOL_MODE: {pool_mode!r}")
+
+    kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if pool_mode == "transaction":
+        # Behind a transaction pooler every transaction may land on a different
+        # server connection: never leave session state behind, and reuse the
+        # most recently returned connection so idle ones can be reaped upstream.
+        kwargs["pool_reset_on_return"] = "rollback"
+        kwargs["pool_use_lifo"] = True
+
+    return kwargs
+
+
+def _instrument(sync_engine, stats: PoolStats):
+    @event.listens_for(sync_engine, "do_connect")
+    def _timed_connect(dialect, conn_rec, cargs, cparams):
+        # Time the TCP + TLS + auth handshake of every new DBAPI connection
+        start = time.perf_counter()
+        conn = dialect.connect(*cargs, **cparams)
+        stats.on_connect((time.perf_counter() - start) * 1000)
+        return conn
+
+    event.listen(sync_engine.pool, "checkout", stats.on_checkout)
+    event.listen(sync_engine.pool, "checkin", stats.on_checkin)
+    event.listen(sync_engine.pool, "invalidate", stats.on_invalidate)
+
+
+def create_db_engine(url: str = None, pool_mode: str = None):
+    pool_mode = pool_mode or settings.DB_POOL_MODE
+
+    # psycopg2 never creates server-side prepared statements, so the
+    # sync driver needs no extra flags for transaction-pooler mode.
+    db_engine = create_engine(
+        url or settings.DATABASE_URL,
+        connect_args={"sslmode": settings.DB_SSLMODE},
+        **_pool_kwargs(pool_mode),
+    )
+    _instrument(db_engine, pool_stats)
+    return db_engine
+
+
+def create_async_db_engine(url: str = None, pool_mode: str = None):
+    pool_mode = pool_mode or settings.DB_POOL_MODE
+
+    connect_args = {"ssl": settings.DB_SSLMODE}
+    if pool_mode == "transaction":
+        # asyncpg prepares every statement; a transaction pooler may run the
+        # next EXECUTE on a different server connection, so disable both
+        # statement caches and give each prepared statement a unique name.
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+
+    db_engine = create_async_engine(
+        url or settings.ASYNC_DATABASE_URL,
+        connect_args=connect_args,
+        **_pool_kwargs(pool_mode),
+    )
+    _instrument(db_engine.sync_engine, async_pool_stats)
+    return db_engine
+
+
 # -----------------------------
 # SQLAlchemy Engine
 # -----------------------------
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=NullPool,                  # REQUIRED for Supabase Pooler
-    connect_args={"sslmode": "require"}, # REQUIRED for Supabase
-)
+engine = create_db_engine()
+async_engine = create_async_db_engine()
 
 # -----------------------------
 # Session factory
@@ -22,11 +160,97 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# expire_on_commit=False: attributes must stay readable after commit,
+# lazy refreshes are not possible on an AsyncSession.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def use_async_database(url: str, pool_mode: str = None):
+    """
+    Points the async engine and AsyncSessionLocal at another database,
+    given as a plain postgresql:// URL (import CLI, benchmarks, tests).
+    Returns the new engine; the caller disposes it.
+    """
+    global async_engine
+    async_engine = create_async_db_engine(url.replace("postgresql://", "postgresql+asyncpg://"), pool_mode=pool_mode)
+    AsyncSessionLocal.configure(bind=async_engine)
+    return async_engine
+
+
 # -----------------------------
 # Base class for models
 # -----------------------------
 Base = declarative_base()
 
+
+# -----------------------------
+# Pool warm-up / stats
+# -----------------------------
+def warm_pool(size: int = None) -> int:
+    """
+    Opens `size` connections up front and returns them to the pool,
+    so the first requests don't pay the TCP + TLS + auth handshake.
+    """
+    if isinstance(engine.pool, NullPool):
+        return 0
+
+    size = settings.DB_POOL_WARM if size is None else size
+    size = min(size, settings.DB_POOL_SIZE)
+
+    conns = []
+    try:
+        for _ in range(size):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+    return len(conns)
+
+
+async def warm_async_pool(size: int = None) -> int:
+    if isinstance(async_engine.pool, NullPool):
+        return 0
+
+    size = settings.DB_POOL_WARM if size is None else size
+    size = min(size, settings.DB_POOL_SIZE)
+
+    # Opened concurrently; if one fails, the others must still be closed
+    results = await asyncio.gather(*(async_engine.connect() for _ in range(size)), return_exceptions=True)
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    finally:
+        for conn in conns:
+            await conn.close()
+    return len(conns)
+
+
+def _engine_stats(pool, stats: PoolStats) -> dict:
+    out = stats.snapshot()
+    out["status"] = pool.status()
+    if not isinstance(pool, NullPool):
+        # checked_out at pool_size + max_overflow means requests are queueing
+        out["checked_out"] = pool.checkedout()
+        out["overflow"] = pool.overflow()
+        out["capacity"] = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return out
+
+
+def get_pool_stats() -> dict:
+    return {
+        "mode": settings.DB_POOL_MODE,
+        "async": _engine_stats(async_engine.pool, async_pool_stats),
+        "sync": _engine_stats(engine.pool, pool_stats),
+    }
+
+
 # -----------------------------
 # FastAPI DB dependency
 # -----------------------------
@@ -36,3 +260,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,17 +1,135 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from Accesco_chatbot.app.routers.webhook import router as webhook_router
+from Accesco_chatbot.app.routers.admin import router as admin_router
 from fastapi import Request                                                                                             
 
-app = FastAPI()
+from Accesco_chatbot.app.database import (
+    AsyncSessionLocal,
+    async_engine,
+    engine,
+    get_pool_stats,
+    warm_async_pool,
+)
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.utils import metrics
+from Accesco_chatbot.app.utils.idempotency import webhook_responses
+from Accesco_chatbot.app.utils.ids import order_ids
+from Accesco_chatbot.app.utils.log import setup_logging, shutdown_logging
+from Accesco_chatbot.app.services.catalog_service import catalog
+from Accesco_chatbot.app.services.cart_sweeper import cart_sweeper
+from Accesco_chatbot.app.services.ingredient_pricing import ingredient_index
+from Accesco_chatbot.app.services.order_status import order_status
+from Accesco_chatbot.app.services.write_behind import write_behind
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+
+    if settings.ORDER_ID_NODE is None:
+        # Confirm retries a duplicate order_id, but distinct nodes avoid it
+        logger.warning("ORDER_ID_NODE not set, order ID node hashed from host and pid",
+                       extra={"node": order_ids.node})
+
+    try:
+        warmed = await warm_async_pool()
+        logger.info("db pool warmed", extra={"connections": warmed})
+    except Exception:
+        logger.warning("db pool warm-up failed", exc_info=True)
+
+    if catalog.enabled:
+        try:
+            async with AsyncSessionLocal() as db:
+                await catalog.refresh(db)
+            logger.info("product catalog loaded", extra={"products": catalog.stats()["products"]})
+        except Exception:
+            logger.warning("product catalog preload failed", exc_info=True)
+
+    if ingredient_index.enabled:
+        try:
+            async with AsyncSessionLocal() as db:
+                await ingredient_index.refresh(db)
+            logger.info("ingredient index loaded", extra={"ingredients": ingredient_index.stats()["ingredients"]})
+        except Exception:
+            logger.warning("ingredient index preload failed", exc_info=True)
+
+    # Memory / redis carts expire by TTL on their own
+    if settings.CART_STORE == "postgres":
+        cart_sweeper.start()
+
+    write_behind.start()
+
+    yield
+
+    await cart_sweeper.stop()
+    await write_behind.stop()
+
+    await async_engine.dispose()
+    engine.dispose()
+
+    shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# -----------------------------
+# Metrics
+# -----------------------------
+metrics.instrument_engine(async_engine.sync_engine)
+app.middleware("http")(metrics.track_request)
+
+metrics.registry.gauge(
+    "db_pool_in_use", "Async pool connections checked out.",
+    lambda: get_pool_stats()["async"]["in_use"])
+metrics.registry.gauge(
+    "catalog_hits_total", "Product catalog cache hits.", lambda: catalog.hits, kind="counter")
+metrics.registry.gauge(
+    "catalog_misses_total", "Product catalog cache misses.", lambda: catalog.misses, kind="counter")
+metrics.registry.gauge(
+    "ingredient_index_hits_total", "Ingredient prices served from the index.",
+    lambda: ingredient_index.hits, kind="counter")
+metrics.registry.gauge(
+    "ingredient_index_misses_total", "Requested ingredients not in the index.",
+    lambda: ingredient_index.misses, kind="counter")
+metrics.registry.gauge(
+    "cart_sweeper_swept_total", "temp_cart rows removed by the sweeper.",
+    lambda: cart_sweeper.total_swept, kind="counter")
+metrics.registry.gauge(
+    "order_status_hits_total", "Order tracking answered from the read model.",
+    lambda: order_status.hits, kind="counter")
+metrics.registry.gauge(
+    "order_status_misses_total", "Order tracking that had to query orders.",
+    lambda: order_status.misses, kind="counter")
+metrics.registry.gauge(
+    "write_behind_depth", "Rows waiting in the write-behind buffer.", lambda: write_behind.depth)
+metrics.registry.gauge(
+    "write_behind_dropped_total", "Rows dropped because the write-behind buffer was full.",
+    lambda: write_behind.dropped, kind="counter")
+metrics.registry.gauge(
+    "write_behind_rejected_total", "Rows the database rejected on a write-behind flush.",
+    lambda: write_behind.rejected, kind="counter")
+metrics.registry.gauge(
+    "webhook_replays_total", "Retried deliveries answered from the response cache.",
+    lambda: webhook_responses.hits + webhook_responses.joins, kind="counter")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 
 templates = Jinja2Templates(directory="app/templates")
 
 from Accesco_chatbot.app.database import SessionLocal
 from sqlalchemy import text
-from Accesco_chatbot.app.database import engine
 
 @app.get("/db-test")
 def db_test():
@@ -39,4 +157,6 @@ def show_chat(request: Request):
     )
 
 # 👇 DIALOGFLOW WEBHOOK
-app.include_router(webhook_router)
\ No newline at end of file
+app.include_router(webhook_router)
+
+app.include_router(admin_router)
\ No newline at end of file
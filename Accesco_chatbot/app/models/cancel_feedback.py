@@ -6,6 +6,6 @@ class Cancel_Feedback(Base):
     __tablename__ = "cancel_feedback"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(String(50), nullable=False)
+    order_id = Column(String(50), nullable=False, index=True)
     feedback = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, Index
 from Accesco_chatbot.app.database import Base
 
 class Products(Base):
     __tablename__ = "products"
+    # The trigram index on name is created by migration 0002 (needs pg_trgm)
+    __table_args__ = (
+        Index("ix_products_name_available", "name", "available"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
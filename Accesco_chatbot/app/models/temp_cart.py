@@ -19,6 +19,6 @@ class TempCart(Base):
     status = Column(String, default="ACTIVE")
 
     created_at = Column(TIMESTAMP, server_default=func.now())
-    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), index=True)
 
 
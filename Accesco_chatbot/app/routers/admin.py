@@ -0,0 +1,116 @@
+# app/routers/admin.py
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.database import get_async_db, get_pool_stats
+from Accesco_chatbot.app.services.catalog_service import catalog
+from Accesco_chatbot.app.services.cart_sweeper import cart_sweeper
+from Accesco_chatbot.app.services.ingredient_pricing import ingredient_index
+from Accesco_chatbot.app.services.order_ingest import import_orders
+from Accesco_chatbot.app.services.order_status import order_status
+from Accesco_chatbot.app.services.write_behind import write_behind
+from Accesco_chatbot.app.utils.extract import loads
+from Accesco_chatbot.app.utils.idempotency import webhook_responses
+
+
+# Keys anyone can read in this repo
+INSECURE_ADMIN_KEYS = {"", "dev-secret"}
+
+
+def require_admin(x_admin_key: str = Header(default="")):
+    if settings.ADMIN_API_KEY in INSECURE_ADMIN_KEYS:
+        raise HTTPException(status_code=503, detail="Admin API disabled: ADMIN_API_KEY is not set")
+    if not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/db-pool")
+def db_pool():
+    return get_pool_stats()
+
+
+@router.get("/catalog")
+def catalog_stats():
+    return catalog.stats()
+
+
+@router.post("/catalog/invalidate")
+def invalidate_catalog():
+    catalog.invalidate()
+    return {"invalidated": True}
+
+
+@router.get("/ingredients")
+def ingredient_index_stats():
+    return ingredient_index.stats()
+
+
+@router.post("/ingredients/invalidate")
+def invalidate_ingredient_index():
+    ingredient_index.invalidate()
+    return {"invalidated": True}
+
+
+@router.get("/cart-sweeper")
+def cart_sweeper_stats():
+    return cart_sweeper.stats()
+
+
+@router.post("/cart-sweeper/run")
+async def run_cart_sweeper():
+    swept = await cart_sweeper.sweep_once()
+    return {"swept": swept, **cart_sweeper.stats()}
+
+
+@router.get("/order-status")
+def order_status_stats():
+    return order_status.stats()
+
+
+@router.post("/order-status/invalidate")
+def invalidate_order_status(order_id: str = None):
+    order_status.invalidate(order_id)
+    return {"invalidated": order_id or "all"}
+
+
+@router.get("/write-behind")
+def write_behind_stats():
+    return write_behind.stats()
+
+
+@router.post("/write-behind/flush")
+async def flush_write_behind():
+    written = await write_behind.flush()
+    return {"written": written, **write_behind.stats()}
+
+
+@router.get("/idempotency")
+def idempotency_stats():
+    return webhook_responses.stats()
+
+
+@router.post("/orders/import")
+async def import_orders_endpoint(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Body: a JSON list of orders, each
+    {"platform", "items": [{"item", "quantity", "customization"}], "session_id"?, "created_at"?}.
+    Invalid rows are reported in "errors" by list index; the rest are inserted.
+    """
+    try:
+        orders = loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    if not isinstance(orders, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON list of orders")
+    if len(orders) > settings.ORDER_IMPORT_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.ORDER_IMPORT_MAX} orders per call, use the import_orders CLI",
+        )
+    return await import_orders(db, orders)
@@ -1,9 +1,17 @@
 # app/routers/webhook.py
-from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
 import time
 
-from Accesco_chatbot.app.database import get_db
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.database import get_async_db
+from Accesco_chatbot.app.utils import metrics
+from Accesco_chatbot.app.utils.dispatcher import IntentDispatcher
+from Accesco_chatbot.app.utils.extract import DialogflowRequest, loads
+from Accesco_chatbot.app.utils.idempotency import idempotency_key, webhook_responses
+from Accesco_chatbot.app.utils.log import intent_logger
+from Accesco_chatbot.app.utils.responses import FulfillmentResponse
 from Accesco_chatbot.app.services.order_service import (
     handle_add_item,
     handle_confirm_order,
@@ -17,121 +25,189 @@ from Accesco_chatbot.app.services.cancel_service import (
 )
 
 router = APIRouter()
+intents = IntentDispatcher()
+logger = logging.getLogger(__name__)
 
-print(">>> WEBHOOK LOADED <<<")
 
+# ============================================================
+# 🧺 ADD ITEM — SWADISHT (RICH RESPONSE)
+# ============================================================
+@intents.prefix("order swadisht - custom", unless="- no")
+async def _add_item_swadisht(req: DialogflowRequest, db: AsyncSession):
+    return await handle_add_item(
+        req=req,
+        db=db,
+        platform="Swadisht",
+        item_param="eatfeast-food-items"
+    )
 
-@router.post("/webhook")
-async def webhook(
-    request: Request,
-    db: Session = Depends(get_db)
-):
-    start_time = time.time()
 
-    try:
-        body = await request.json()
-    except Exception:
-        return {"fulfillmentText": "Invalid JSON received."}
+# ============================================================
+# ✅ CONFIRM ORDER — SWADISHT
+# ============================================================
+@intents.prefix("order swadisht - custom - no", "create-custom-food - confirm")
+async def _confirm_swadisht(req: DialogflowRequest, db: AsyncSession):
+    return await handle_confirm_order(req=req, db=db, platform="Swadisht")
 
-    query = body.get("queryResult", {}) or {}
-    intent = query.get("intent", {}).get("displayName", "") or ""
-    params = query.get("parameters", {}) or {}
 
-    intent_lower = intent.lower()
+# ============================================================
+# 🧺 ADD ITEM — GROKLY (RICH RESPONSE)
+# ============================================================
+@intents.prefix("order grokly - custom", unless="- no")
+async def _add_item_grokly(req: DialogflowRequest, db: AsyncSession):
+    return await handle_add_item(
+        req=req,
+        db=db,
+        platform="Grokly",
+        item_param="GroMArt-grocery"
+    )
 
-    print("\n---------------------------")
-    print("Intent Triggered:", intent)
-    print("Parameters:", params)
-    print("---------------------------\n")
 
-    # ============================================================
-    # 🧺 ADD ITEM — SWADISHT (SYNC, RICH RESPONSE)
-    # ============================================================
-    if intent_lower.startswith("order swadisht - custom") and "- no" not in intent_lower:
-        print("Adding item to Swadisht cart...")
+# ============================================================
+# ✅ CONFIRM ORDER — GROKLY
+# ============================================================
+@intents.prefix("order grokly - custom - no")
+async def _confirm_grokly(req: DialogflowRequest, db: AsyncSession):
+    return await handle_confirm_order(req=req, db=db, platform="Grokly")
 
-        response = handle_add_item(
-            body=body,
-            db=db,
-            platform="Swadisht",
-            item_param="eatfeast-food-items"
-        )
 
-        print("⏱️ Webhook time:",
-              round((time.time() - start_time) * 1000, 2), "ms")
+# ============================================================
+# 🍳 CREATE CUSTOM FOOD
+# ============================================================
+@intents.exact("create-custom-food")
+async def _create_custom_food(req: DialogflowRequest, db: AsyncSession):
+    return await handle_create_custom_food(req=req, db=db, platform="Swadisht")
 
-        return response
 
-    # ============================================================
-    # ✅ CONFIRM ORDER — SWADISHT
-    # ============================================================
-    if intent_lower.startswith("order swadisht - custom - no"):
-        response = handle_confirm_order(body=body, db=db, platform="Swadisht")
-        return response
+# ============================================================
+# ❌ CANCEL ORDER
+# ============================================================
+@intents.exact("cancel order")
+async def _cancel_order(req: DialogflowRequest, db: AsyncSession):
+    return {"fulfillmentText": await handle_cancel_order(req=req, db=db)}
 
-    if intent_lower.startswith("create-custom-food - confirm"):
-        response = handle_confirm_order(body=body, db=db, platform="Swadisht")
-        return response
 
-    # ============================================================
-    # 🧺 ADD ITEM — GROKLY (SYNC, RICH RESPONSE)
-    # ============================================================
-    if intent_lower.startswith("order grokly - custom") and "- no" not in intent_lower:
-        print("Adding item to Grokly cart...")
+@intents.exact("cancel order - yes")
+async def _cancel_confirm(req: DialogflowRequest, db: AsyncSession):
+    return {"fulfillmentText": await handle_cancel_confirm(req=req, db=db)}
 
-        response = handle_add_item(
-            body=body,
-            db=db,
-            platform="Grokly",
-            item_param="GroMArt-grocery"
-        )
 
-        print("⏱️ Webhook time:",
-              round((time.time() - start_time) * 1000, 2), "ms")
+@intents.exact("cancel order - yes - confirm")
+async def _cancel_feedback(req: DialogflowRequest, db: AsyncSession):
+    return {"fulfillmentText": await handle_cancel_feedback(req=req, db=db)}
 
-        return response
 
-    # ============================================================
-    # ✅ CONFIRM ORDER — GROKLY
-    # ============================================================
-    if intent_lower.startswith("order grokly - custom - no"):
-        response = handle_confirm_order(body=body, db=db, platform="Grokly")
-        return response
+# ============================================================
+# 🚚 TRACK ORDER
+# ============================================================
+@intents.contains("track order")
+async def _track_order(req: DialogflowRequest, db: AsyncSession):
+    return {"fulfillmentText": await handle_track_order(req=req, db=db)}
 
-    # ============================================================
-    # 🍳 CREATE CUSTOM FOOD
-    # ============================================================
-    if intent_lower == "create-custom-food":
-        response = handle_create_custom_food(
-            body=body,
-            db=db,
-            platform="Swadisht"
-        )
-        return response
 
-    # ============================================================
-    # ❌ CANCEL ORDER
-    # ============================================================
-    if intent_lower == "cancel order":
-        reply = handle_cancel_order(body=body, db=db)
-        return {"fulfillmentText": reply}
+intents.compile()
+logger.debug("webhook router loaded", extra={"routes": intents.routes()})
 
-    if intent_lower == "cancel order - yes":
-        reply = handle_cancel_confirm(body=body, db=db)
-        return {"fulfillmentText": reply}
 
-    if intent_lower == "cancel order - yes - confirm":
-        reply = handle_cancel_feedback(body=body, db=db)
-        return {"fulfillmentText": reply}
+def _respond(payload, record) -> FulfillmentResponse:
+    start = time.perf_counter()
+    response = FulfillmentResponse(content=payload)
+    if record is not None:
+        record.serialization_seconds = time.perf_counter() - start
+    return response
 
-    # ============================================================
-    # 🚚 TRACK ORDER
-    # ============================================================
-    if "track order" in intent_lower:
-        reply = handle_track_order(body=body, db=db)
-        return {"fulfillmentText": reply}
+
+def _handler_name(handler) -> str:
+    # Label by handler, not by raw displayName, to keep series and loggers bounded
+    return handler.__name__.lstrip("_") if handler else "fallback"
+
+
+async def dispatch(req: DialogflowRequest, db: AsyncSession, record=None) -> dict:
+    """Runs one parsed Dialogflow request through its intent handler."""
+    handler = intents.resolve(req.intent)
+    handler_name = _handler_name(handler)
+    if record is not None:
+        record.intent = handler_name
+
+    log = intent_logger(handler_name)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("intent triggered", extra={
+            "intent": req.intent,
+            "params": req.parameters,
+        })
 
     # ============================================================
     # FALLBACK
     # ============================================================
-    return {"fulfillmentText": "Sorry, I didn't understand that."}
+    if handler is None:
+        return {"fulfillmentText": "Sorry, I didn't understand that."}
+
+    # A retried delivery replays the first response instead of re-running
+    # the handler (double cart adds, a second confirm on an emptied cart)
+    return await webhook_responses.run(
+        idempotency_key(req),
+        lambda: handler(req, db),
+    )
+
+
+@router.post("/webhook")
+async def webhook(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    record = metrics.current()
+
+    try:
+        req = DialogflowRequest.from_bytes(await request.body())
+    except ValueError:
+        if record is not None:
+            record.intent = "invalid_json"
+        return _respond({"fulfillmentText": "Invalid JSON received."}, record)
+
+    response = await dispatch(req, db, record)
+
+    return _respond(response, record)
+
+
+# ============================================================
+# 📦 BATCH — several turns in one HTTP call
+# ============================================================
+@router.post("/webhook/batch")
+async def webhook_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Takes a JSON list of Dialogflow request bodies and returns the list of
+    responses, in order. Turns run one after another on one session, so a
+    batch behaves exactly like posting the bodies to /webhook in sequence
+    (each turn still commits its own writes), minus the per-request
+    overhead. A turn that fails is rolled back and answered with an error
+    entry; the following turns still run.
+    """
+    record = metrics.current()
+    if record is not None:
+        record.intent = "batch"
+
+    try:
+        bodies = loads(await request.body())
+    except ValueError:
+        bodies = None
+    if not isinstance(bodies, list):
+        return _respond({"fulfillmentText": "Expected a JSON list of webhook requests."}, record)
+    if len(bodies) > settings.WEBHOOK_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {settings.WEBHOOK_BATCH_MAX} requests per batch")
+
+    responses = []
+    for i, body in enumerate(bodies):
+        if not isinstance(body, dict):
+            responses.append({"fulfillmentText": "Invalid JSON received."})
+            continue
+        try:
+            responses.append(await dispatch(DialogflowRequest.from_body(body), db))
+        except Exception as e:
+            await db.rollback()
+            logger.exception("batch turn failed", extra={"index": i})
+            responses.append({"fulfillmentText": "Sorry, something went wrong.", "error": type(e).__name__})
+
+    return _respond(responses, record)
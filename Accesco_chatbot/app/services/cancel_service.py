@@ -1,33 +1,34 @@
 # app/services/cancel_service.py
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from Accesco_chatbot.app.models.orders import Orders
 from Accesco_chatbot.app.models.cancel_feedback import Cancel_Feedback
+from Accesco_chatbot.app.services.order_status import order_status
+from Accesco_chatbot.app.services.write_behind import write_behind
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+from Accesco_chatbot.app.utils.ids import normalize_order_id
 
 
 # -------------------------------------------------------
 # STEP 1: Ask user to confirm cancellation
 # -------------------------------------------------------
-def handle_cancel_order(body: dict, db: Session):
-    params = body.get("queryResult", {}).get("parameters", {}) or {}
-
-    # Try reading order_id from parameters
-    order_id = params.get("order_id")
-
-    # If not in parameters, try reading from contexts
-    if not order_id:
-        contexts = body.get("queryResult", {}).get("outputContexts", []) or []
-        for ctx in contexts:
-            ctx_params = ctx.get("parameters", {}) or {}
-            if "order_id" in ctx_params:
-                order_id = ctx_params.get("order_id")
-                break
+async def handle_cancel_order(req: DialogflowRequest, db: AsyncSession):
+    # From this turn's parameters, else from a context
+    order_id = req.param("order_id")
 
     # Still nothing?
     if not order_id:
         return f"Please tell me the Order ID you want to cancel."
 
+    # Malformed IDs can't match an order: answered without a query
+    canonical = normalize_order_id(order_id)
+    if canonical is None:
+        return f"I couldn't find any order with ID {order_id}. Please check again."
+
     # Check if order exists
-    order = db.query(Orders).filter(Orders.order_id == order_id).first()
+    order = await order_status.get(db, canonical)
 
     if not order:
         return f"I couldn't find any order with ID {order_id}. Please check again."
@@ -39,28 +40,28 @@ def handle_cancel_order(body: dict, db: Session):
 # -------------------------------------------------------
 # STEP 2: User says "Yes" → Cancel the order
 # -------------------------------------------------------
-def handle_cancel_confirm(body: dict, db: Session):
-    contexts = body.get("queryResult", {}).get("outputContexts", []) or []
-
-    order_id = None
-    for ctx in contexts:
-        ctx_params = ctx.get("parameters", {}) or {}
-        if "order_id" in ctx_params:
-            order_id = ctx_params.get("order_id")
-            break
+async def handle_cancel_confirm(req: DialogflowRequest, db: AsyncSession):
+    order_id = req.param("order_id")
 
     if not order_id:
         return "I couldn't identify which order to cancel. Please say the Order ID again."
 
+    canonical = normalize_order_id(order_id)
+    if canonical is None:
+        return f"Order {order_id} was not found in our system."
+
     # Fetch DB order
-    order = db.query(Orders).filter(Orders.order_id == order_id).first()
+    order = (
+        await db.execute(select(Orders).where(Orders.order_id == canonical))
+    ).scalars().first()
 
     if not order:
         return f"Order {order_id} was not found in our system."
 
     # Cancel the order
     order.status = "cancelled"
-    db.commit()
+    await db.commit()
+    order_status.set_status(canonical, "cancelled")
 
     # Ask user for feedback → store order_id in context for next step
     return f"Your order {order_id} has been cancelled. Could you tell me why you cancelled it?"
@@ -69,24 +70,23 @@ def handle_cancel_confirm(body: dict, db: Session):
 # -------------------------------------------------------
 # STEP 3: Save the feedback message
 # -------------------------------------------------------
-def handle_cancel_feedback(body: dict, db: Session):
-    params = body.get("queryResult", {}).get("parameters", {}) or {}
-    feedback = params.get("feedback") or "No feedback provided."
-
-    contexts = body.get("queryResult", {}).get("outputContexts", []) or []
-    order_id = None
-
-    for ctx in contexts:
-        ctx_params = ctx.get("parameters", {}) or {}
-        if "order_id" in ctx_params:
-            order_id = ctx_params.get("order_id")
+async def handle_cancel_feedback(req: DialogflowRequest, db: AsyncSession):
+    feedback = req.parameters.get("feedback") or "No feedback provided."
+    order_id = req.param("order_id")
 
     if not order_id:
         return "Thank you for your feedback."
 
-    # Save feedback
-    fb = Cancel_Feedback(order_id=order_id, feedback=feedback)
-    db.add(fb)
-    db.commit()
+    # Malformed IDs match no order, and the table would reject long ones
+    canonical = normalize_order_id(order_id)
+    if canonical is None:
+        return "Thank you for your feedback."
+
+    # Save feedback (written in the background, the reply doesn't wait on it)
+    write_behind.add(Cancel_Feedback.__table__, {
+        "order_id": canonical,
+        "feedback": feedback,
+        "created_at": datetime.utcnow(),
+    })
 
     return "Thank you for your feedback. We appreciate it!"
@@ -0,0 +1,345 @@
+# app/services/cart_store.py
+import asyncio
+import json
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Numeric, bindparam, delete, select, text
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.models.temp_cart import TempCart
+
+CartLines = List[Dict[str, Any]]
+
+
+def cart_total(cart_items: List[Dict[str, Any]]) -> Decimal:
+    total = sum((Decimal(str(i["total_price"])) for i in cart_items), Decimal("0"))
+    return total.quantize(Decimal("0.01"))
+
+
+def _line_key(line: Dict[str, Any]) -> Tuple[Any, str]:
+    return line["item"], repr(line.get("customization"))
+
+
+def dedupe_lines(lines: CartLines) -> CartLines:
+    """
+    Collapses lines for the same (item, customization): the last one wins
+    but keeps the position of the first, like the old in-Python merge.
+    """
+    merged: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+    for line in lines:
+        merged[_line_key(line)] = line
+    return list(merged.values())
+
+
+def merge_lines_into(cart_items: CartLines, lines: CartLines) -> CartLines:
+    """In-Python equivalent of the Postgres merge below."""
+    incoming = {_line_key(line): line for line in dedupe_lines(lines)}
+    merged = []
+    for line in cart_items:
+        merged.append(incoming.pop(_line_key(line), line))
+    merged.extend(incoming.values())
+    return merged
+
+
+# -------------------------------------------------------------
+# Merge lines into the active cart in ONE statement.
+#
+# Existing lines with the same item + customization are replaced in
+# place, new ones are appended, and the total is recomputed server side.
+# A non-ACTIVE row left over for the session is reset. ON CONFLICT takes
+# the row lock, so concurrent turns of one session cannot lose lines.
+# -------------------------------------------------------------
+_SAME_LINE = (
+    "{a}.line->'item' = {b}.line->'item' "
+    "AND COALESCE({a}.line->'customization', 'null'::jsonb) "
+    "= COALESCE({b}.line->'customization', 'null'::jsonb)"
+)
+_CURRENT_ITEMS = (
+    "CASE WHEN temp_cart.status = 'ACTIVE' THEN temp_cart.cart_items ELSE '[]'::jsonb END"
+)
+
+_MERGE_SQL = text(f"""
+INSERT INTO temp_cart (session_id, cart_items, total_price, status, created_at, updated_at)
+VALUES (:session_id, :lines, :total, 'ACTIVE', now(), now())
+ON CONFLICT (session_id) DO UPDATE SET
+    (cart_items, total_price) = (
+        SELECT merged.items,
+               COALESCE((SELECT sum((l->>'total_price')::numeric)
+                         FROM jsonb_array_elements(merged.items) AS l), 0)
+        FROM (
+            SELECT COALESCE(jsonb_agg(m.line ORDER BY m.pos), '[]'::jsonb) AS items
+            FROM (
+                SELECT COALESCE(
+                           (SELECT n.line
+                            FROM jsonb_array_elements(EXCLUDED.cart_items) AS n(line)
+                            WHERE {_SAME_LINE.format(a="n", b="o")}
+                            LIMIT 1),
+                           o.line
+                       ) AS line,
+                       o.pos
+                FROM jsonb_array_elements({_CURRENT_ITEMS}) WITH ORDINALITY AS o(line, pos)
+                UNION ALL
+                SELECT n.line, 1000000 + n.pos
+                FROM jsonb_array_elements(EXCLUDED.cart_items) WITH ORDINALITY AS n(line, pos)
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM jsonb_array_elements({_CURRENT_ITEMS}) AS o(line)
+                    WHERE {_SAME_LINE.format(a="o", b="n")}
+                )
+            ) AS m
+        ) AS merged
+    ),
+    status = 'ACTIVE',
+    updated_at = now()
+RETURNING cart_items, total_price
+""").bindparams(
+    bindparam("lines", type_=JSONB),
+    bindparam("total", type_=Numeric(10, 2)),
+).columns(cart_items=JSONB, total_price=Numeric(10, 2))
+
+
+class CartStore(ABC):
+    """
+    Per-session cart storage used by the order handlers.
+
+    Every method takes the request's DB session so the Postgres store can
+    share its transaction; other stores ignore it. Writes are visible once
+    the caller commits (Postgres) or immediately (memory / redis).
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def merge_lines(self, db: AsyncSession, session_id: str, lines: CartLines) -> Tuple[CartLines, Decimal]:
+        """Merges lines into the cart, returns the cart items and total."""
+
+    @abstractmethod
+    async def update(
+        self,
+        db: AsyncSession,
+        session_id: str,
+        mutate: Callable[[CartLines], CartLines],
+    ) -> Tuple[CartLines, Decimal]:
+        """Atomic read-modify-write: `mutate` gets a copy of the items."""
+
+    @abstractmethod
+    async def pop(self, db: AsyncSession, session_id: str) -> Optional[Tuple[CartLines, Decimal]]:
+        """Removes the cart and returns its items and total."""
+
+    @abstractmethod
+    async def restore(self, db: AsyncSession, session_id: str, cart_items: CartLines):
+        """
+        Puts back a popped cart whose order failed to commit, after the
+        caller rolled back. Lines added since the pop win over the old ones.
+        """
+
+
+# -------------------------------------------------------------
+# Postgres (temp_cart table)
+# -------------------------------------------------------------
+class PostgresCartStore(CartStore):
+    name = "postgres"
+
+    async def merge_lines(self, db, session_id, lines):
+        lines = dedupe_lines(lines)
+        row = (
+            await db.execute(
+                _MERGE_SQL,
+                {"session_id": session_id, "lines": lines, "total": cart_total(lines)},
+            )
+        ).one()
+        return list(row.cart_items), Decimal(row.total_price)
+
+    async def _lock(self, db: AsyncSession, session_id: str) -> TempCart:
+        """
+        Returns the session's cart row locked FOR UPDATE (created if missing).
+        """
+        await db.execute(
+            pg_insert(TempCart)
+            .values(session_id=session_id, cart_items=[], total_price=0, status="ACTIVE")
+            .on_conflict_do_nothing(index_elements=[TempCart.session_id])
+        )
+
+        cart = (
+            await db.execute(
+                select(TempCart)
+                .where(TempCart.session_id == session_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+        ).scalars().one()
+
+        if cart.status != "ACTIVE":
+            cart.cart_items = []
+            cart.total_price = 0
+            cart.status = "ACTIVE"
+        return cart
+
+    async def update(self, db, session_id, mutate):
+        # Row lock held until the caller commits
+        cart = await self._lock(db, session_id)
+        cart_items = mutate([dict(i) for i in cart.cart_items])
+        cart.cart_items = cart_items
+        cart.total_price = cart_total(cart_items)
+        cart.updated_at = datetime.utcnow()
+        return cart_items, cart.total_price
+
+    async def pop(self, db, session_id):
+        # Two concurrent confirms can't both get the same cart
+        row = (
+            await db.execute(
+                delete(TempCart)
+                .where(TempCart.session_id == session_id, TempCart.status == "ACTIVE")
+                .returning(TempCart.cart_items, TempCart.total_price)
+            )
+        ).first()
+        if row is None:
+            return None
+        return list(row.cart_items or []), Decimal(row.total_price or 0)
+
+    async def restore(self, db, session_id, cart_items):
+        # The caller's rollback already undid the DELETE
+        return None
+
+
+# -------------------------------------------------------------
+# In-process memory (single worker / tests)
+# -------------------------------------------------------------
+class MemoryCartStore(CartStore):
+    """
+    Carts live in a dict with a sliding TTL. Nothing awaits between the
+    read and the write, so every operation is atomic on the event loop.
+    """
+
+    name = "memory"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._carts: Dict[str, Tuple[float, CartLines]] = {}
+        self._writes = 0
+
+    def _get(self, session_id: str) -> CartLines:
+        entry = self._carts.get(session_id)
+        if entry is None or entry[0] < time.monotonic():
+            self._carts.pop(session_id, None)
+            return []
+        return [dict(i) for i in entry[1]]
+
+    def _put(self, session_id: str, cart_items: CartLines):
+        self._carts[session_id] = (time.monotonic() + self.ttl, cart_items)
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._carts.items() if exp < now]
+        for k in expired:
+            del self._carts[k]
+        return len(expired)
+
+    async def merge_lines(self, db, session_id, lines):
+        cart_items = merge_lines_into(self._get(session_id), lines)
+        self._put(session_id, cart_items)
+        return cart_items, cart_total(cart_items)
+
+    async def update(self, db, session_id, mutate):
+        cart_items = mutate(self._get(session_id))
+        self._put(session_id, cart_items)
+        return cart_items, cart_total(cart_items)
+
+    async def pop(self, db, session_id):
+        cart_items = self._get(session_id)
+        self._carts.pop(session_id, None)
+        if not cart_items:
+            return None
+        return cart_items, cart_total(cart_items)
+
+    async def restore(self, db, session_id, cart_items):
+        self._put(session_id, merge_lines_into(cart_items, self._get(session_id)))
+
+
+# -------------------------------------------------------------
+# Redis (shared between workers)
+# -------------------------------------------------------------
+class RedisCartStore(CartStore):
+    """
+    One JSON value per session under `cart:<session_id>` with a sliding
+    TTL. Read-modify-write uses WATCH/MULTI and retries with jittered
+    backoff on conflict.
+    Pass `client` to use another redis.asyncio-compatible client
+    (e.g. fakeredis) instead of connecting to REDIS_URL.
+    """
+
+    name = "redis"
+    max_retries = 50
+
+    def __init__(self, ttl: int, url: str = None, client=None):
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("CART_STORE=redis requires the 'redis' package") from e
+            client = aioredis.from_url(url)
+
+        from redis.exceptions import WatchError
+
+        self.ttl = ttl
+        self.client = client
+        self._watch_error = WatchError
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"cart:{session_id}"
+
+    async def update(self, db, session_id, mutate):
+        key = self._key(session_id)
+        for attempt in range(self.max_retries):
+            async with self.client.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    cart_items = mutate(json.loads(raw) if raw else [])
+
+                    pipe.multi()
+                    pipe.set(key, json.dumps(cart_items), ex=self.ttl)
+                    await pipe.execute()
+                    return cart_items, cart_total(cart_items)
+                except self._watch_error:
+                    pass
+            await asyncio.sleep(random.uniform(0, 0.002) * (attempt + 1))
+        raise RuntimeError(f"Cart for session {session_id} is too contended")
+
+    async def merge_lines(self, db, session_id, lines):
+        return await self.update(db, session_id, lambda items: merge_lines_into(items, lines))
+
+    async def pop(self, db, session_id):
+        raw = await self.client.getdel(self._key(session_id))
+        if not raw:
+            return None
+        cart_items = json.loads(raw)
+        return cart_items, cart_total(cart_items)
+
+    async def restore(self, db, session_id, cart_items):
+        await self.update(db, session_id, lambda items: merge_lines_into(cart_items, items))
+
+
+def create_cart_store(kind: str = None) -> CartStore:
+    kind = kind or settings.CART_STORE
+    if kind == "postgres":
+        return PostgresCartStore()
+    if kind == "memory":
+        return MemoryCartStore(ttl=settings.CART_TTL)
+    if kind == "redis":
+        return RedisCartStore(ttl=settings.CART_TTL, url=settings.REDIS_URL)
+    raise ValueError(f"Unknown CART_STORE: {kind!r}")
+
+
+cart_store = create_cart_store()
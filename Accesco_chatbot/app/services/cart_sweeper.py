@@ -0,0 +1,125 @@
+# app/services/cart_sweeper.py
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Oldest idle row first; SKIP LOCKED so the sweep never waits on a cart
+# that a webhook turn is updating right now.
+_SWEEP_SQL = text("""
+DELETE FROM temp_cart
+WHERE id IN (
+    SELECT id FROM temp_cart
+    WHERE updated_at < now() - make_interval(secs => :idle_seconds)
+    ORDER BY updated_at
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+)
+""")
+
+_LAG_SQL = text("""
+SELECT EXTRACT(EPOCH FROM (now() - min(updated_at))) - :idle_seconds
+FROM temp_cart
+WHERE updated_at < now() - make_interval(secs => :idle_seconds)
+""")
+
+
+class CartSweeper:
+    """
+    Periodically deletes temp_cart rows idle for longer than `idle_seconds`,
+    in batches of `batch_size` (one transaction each), at most
+    `max_batches` per run.
+    """
+
+    def __init__(self, idle_seconds: int, interval: int, batch_size: int, max_batches: int):
+        self.idle_seconds = idle_seconds
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.total_swept = 0
+        self.last_swept = 0
+        self.last_lag_seconds = 0.0
+        self.last_duration_ms = 0.0
+        self.last_run_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    async def sweep_once(self) -> int:
+        start = time.perf_counter()
+        params = {"idle_seconds": self.idle_seconds, "batch_size": self.batch_size}
+        swept = 0
+
+        async with AsyncSessionLocal() as db:
+            # How far past its TTL the oldest stale cart is
+            lag = (await db.execute(_LAG_SQL, params)).scalar()
+            await db.rollback()
+
+            for _ in range(self.max_batches):
+                result = await db.execute(_SWEEP_SQL, params)
+                await db.commit()
+                swept += result.rowcount
+                if result.rowcount < self.batch_size:
+                    break
+
+        self.runs += 1
+        self.last_swept = swept
+        self.total_swept += swept
+        self.last_lag_seconds = round(float(lag or 0), 1)
+        self.last_duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        self.last_run_at = time.time()
+        return swept
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.sweep_once()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("cart sweep failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "idle_seconds": self.idle_seconds,
+            "runs": self.runs,
+            "last_swept": self.last_swept,
+            "total_swept": self.total_swept,
+            "last_lag_seconds": self.last_lag_seconds,
+            "last_duration_ms": self.last_duration_ms,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+        }
+
+
+cart_sweeper = CartSweeper(
+    idle_seconds=settings.CART_TTL,
+    interval=settings.CART_SWEEP_INTERVAL,
+    batch_size=settings.CART_SWEEP_BATCH,
+    max_batches=settings.CART_SWEEP_MAX_BATCHES,
+)
@@ -0,0 +1,174 @@
+# app/services/catalog_service.py
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.models.products import Products
+
+
+def normalize_name(name) -> str:
+    return " ".join(str(name).split()).lower()
+
+
+class ProductEntry:
+    __slots__ = ("name", "price", "available", "image_url")
+
+    def __init__(self, name: str, price: float, available: bool, image_url: Optional[str]):
+        self.name = name
+        self.price = price
+        self.available = available
+        self.image_url = image_url
+
+
+class ProductCatalog:
+    """
+    In-process snapshot of the products table keyed by normalized name.
+
+    The whole catalog is loaded with one query and served from memory
+    until it is older than `ttl` seconds or invalidate() is called.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._by_name: Dict[str, ProductEntry] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        # Bumped on every refresh so derived indexes know to rebuild
+        self.version = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def refresh(self, db: AsyncSession):
+        rows = (
+            await db.execute(
+                select(
+                    Products.name,
+                    Products.price,
+                    Products.available,
+                    Products.image_url,
+                ).order_by(Products.id)
+            )
+        ).all()
+
+        by_name: Dict[str, ProductEntry] = {}
+        for name, price, available, image_url in rows:
+            key = normalize_name(name)
+            current = by_name.get(key)
+            # Duplicate names: keep the first available row
+            if current is None or (available and not current.available):
+                by_name[key] = ProductEntry(name, price, bool(available), image_url)
+
+        self._by_name = by_name
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+        self.version += 1
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.is_fresh():
+            return
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if not self.is_fresh():
+                await self.refresh(db)
+
+    async def _query_one(self, db: AsyncSession, key: str) -> Optional[ProductEntry]:
+        row = (
+            await db.execute(
+                select(
+                    Products.name,
+                    Products.price,
+                    Products.available,
+                    Products.image_url,
+                )
+                .where(Products.name == key)
+                .order_by(Products.available.desc(), Products.id)
+            )
+        ).first()
+        return ProductEntry(row[0], row[1], bool(row[2]), row[3]) if row else None
+
+    async def get(self, db: AsyncSession, name) -> Optional[ProductEntry]:
+        key = normalize_name(name)
+
+        if not self.enabled:
+            return await self._query_one(db, key)
+
+        await self.ensure_fresh(db)
+        entry = self._by_name.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def entries(self, db: AsyncSession) -> List[ProductEntry]:
+        """All products of a fresh snapshot (requires the cache to be on)."""
+        await self.ensure_fresh(db)
+        return list(self._by_name.values())
+
+    async def get_many(self, db: AsyncSession, names: Iterable) -> Dict[str, ProductEntry]:
+        """
+        Batched lookup keyed by normalized name; names that are not in the
+        catalog are left out. Costs one IN (...) query when caching is off.
+        """
+        keys = {normalize_name(n) for n in names}
+        if not keys:
+            return {}
+
+        if not self.enabled:
+            rows = (
+                await db.execute(
+                    select(
+                        Products.name,
+                        Products.price,
+                        Products.available,
+                        Products.image_url,
+                    )
+                    .where(Products.name.in_(keys))
+                    .order_by(Products.available.desc(), Products.id)
+                )
+            ).all()
+            found: Dict[str, ProductEntry] = {}
+            for name, price, available, image_url in rows:
+                found.setdefault(normalize_name(name), ProductEntry(name, price, bool(available), image_url))
+            return found
+
+        await self.ensure_fresh(db)
+        found = {k: self._by_name[k] for k in keys if k in self._by_name}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "products": len(self._by_name),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "age_seconds": (
+                round(time.monotonic() - self._loaded_at, 1)
+                if self._loaded_at is not None else None
+            ),
+        }
+
+
+catalog = ProductCatalog(ttl=settings.PRODUCT_CACHE_TTL)
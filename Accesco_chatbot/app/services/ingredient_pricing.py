@@ -0,0 +1,160 @@
+# app/services/ingredient_pricing.py
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.models.ingredients import Ingredient
+from Accesco_chatbot.app.services.catalog_service import normalize_name
+
+
+class IngredientEntry:
+    __slots__ = ("key", "name", "price", "image_url")
+
+    def __init__(self, key: str, name: str, price: Decimal, image_url: Optional[str]):
+        self.key = key
+        self.name = name
+        self.price = price
+        self.image_url = image_url
+
+
+class IngredientIndex:
+    """
+    In-process price index over the ingredients table, keyed by normalized
+    name. Loaded with one query and served from memory until it is older
+    than `ttl` seconds or invalidate() is called, like the product catalog.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._by_name: Dict[str, IngredientEntry] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    @staticmethod
+    def _entries(rows) -> Dict[str, IngredientEntry]:
+        by_name: Dict[str, IngredientEntry] = {}
+        for name, price, image_url in rows:
+            key = normalize_name(name)
+            by_name.setdefault(key, IngredientEntry(key, name, Decimal(str(price)), image_url))
+        return by_name
+
+    async def refresh(self, db: AsyncSession):
+        rows = (
+            await db.execute(
+                select(Ingredient.name, Ingredient.price, Ingredient.image_url).order_by(Ingredient.id)
+            )
+        ).all()
+        self._by_name = self._entries(rows)
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.is_fresh():
+            return
+        async with self._lock:
+            if not self.is_fresh():
+                await self.refresh(db)
+
+    async def get_many(self, db: AsyncSession, names: Iterable) -> Dict[str, IngredientEntry]:
+        """
+        Lookup keyed by normalized name; unknown names are left out. Costs
+        one IN (...) query when caching is off, none while the index is fresh.
+        """
+        keys = {normalize_name(n) for n in names}
+        if not keys:
+            return {}
+
+        if not self.enabled:
+            rows = (
+                await db.execute(
+                    select(Ingredient.name, Ingredient.price, Ingredient.image_url)
+                    .where(Ingredient.name.in_(keys))
+                    .order_by(Ingredient.id)
+                )
+            ).all()
+            return self._entries(rows)
+
+        await self.ensure_fresh(db)
+        found = {k: self._by_name[k] for k in keys if k in self._by_name}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "ingredients": len(self._by_name),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "age_seconds": (
+                round(time.monotonic() - self._loaded_at, 1)
+                if self._loaded_at is not None else None
+            ),
+        }
+
+
+class CustomDish:
+    """
+    The ingredients of a custom dish in the order they were first asked
+    for, each charged once, and the running price.
+
+    add() only looks at the ingredients being added: the price is never
+    recomputed from the full list, and asking for an ingredient the dish
+    already has changes nothing.
+    """
+
+    __slots__ = ("ingredients", "price", "_members")
+
+    def __init__(self, ingredients: Iterable[str] = (), price: Decimal = Decimal("0")):
+        self.ingredients: List[str] = list(ingredients)
+        self.price = price
+        self._members = set(self.ingredients)
+        if len(self._members) != len(self.ingredients):
+            # Lines written before dishes were deduplicated
+            self.ingredients = list(dict.fromkeys(self.ingredients))
+
+    @classmethod
+    def from_line(cls, line: dict) -> "CustomDish":
+        """A dish from its cart line (prices are stored as floats there)."""
+        return cls(line.get("ingredients") or [], Decimal(str(line.get("unit_price") or 0)))
+
+    def add(self, entries: Iterable[IngredientEntry]) -> List[IngredientEntry]:
+        """Adds priced ingredients; returns the ones that were new to the dish."""
+        added = []
+        for entry in entries:
+            if entry.key in self._members:
+                continue
+            self._members.add(entry.key)
+            self.ingredients.append(entry.key)
+            self.price += entry.price
+            added.append(entry)
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._members
+
+
+ingredient_index = IngredientIndex(ttl=settings.INGREDIENT_CACHE_TTL)
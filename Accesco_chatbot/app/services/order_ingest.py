@@ -0,0 +1,196 @@
+# app/services/order_ingest.py
+import logging
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.models.orders import Orders
+from Accesco_chatbot.app.services.catalog_service import ProductEntry, catalog, normalize_name
+from Accesco_chatbot.app.services.order_service import cart_line, generate_order_id
+
+logger = logging.getLogger(__name__)
+
+
+class OrderImportError(ValueError):
+    """Why one imported order was rejected; reported against its row."""
+
+
+def _item(raw, n: int) -> Tuple[str, int, Any]:
+    if isinstance(raw, str):
+        raw = {"item": raw}
+    if not isinstance(raw, dict) or not isinstance(raw.get("item"), str) or not raw["item"].strip():
+        raise OrderImportError(f"items[{n}]: item name is required")
+
+    quantity = raw.get("quantity", 1)
+    if isinstance(quantity, float) and quantity.is_integer():
+        quantity = int(quantity)
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+        raise OrderImportError(f"items[{n}]: quantity must be a positive integer")
+
+    return raw["item"].lower(), quantity, raw.get("customization")
+
+
+def _created_at(value) -> datetime:
+    if value is None:
+        return datetime.utcnow()
+    try:
+        created_at = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise OrderImportError(f"created_at is not an ISO 8601 timestamp: {value!r}")
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at
+
+
+def requested_names(orders: Sequence) -> Set[str]:
+    """Every item name in the import, so the catalog is read once for all rows."""
+    names = set()
+    for order in orders:
+        items = order.get("items") if isinstance(order, dict) else None
+        for item in items if isinstance(items, list) else []:
+            name = item.get("item") if isinstance(item, dict) else item
+            if isinstance(name, str):
+                names.add(name.lower())
+    return names
+
+
+def parse_order(raw, products: Dict[str, ProductEntry]) -> Dict[str, Any]:
+    """
+    Validates one order against the catalog snapshot and prices it the
+    way the cart does. Returns the orders row without its order_id.
+    """
+    if not isinstance(raw, dict):
+        raise OrderImportError("order must be a JSON object")
+
+    platform = raw.get("platform")
+    if not isinstance(platform, str) or not platform.strip():
+        raise OrderImportError("platform is required")
+
+    items = raw.get("items")
+    if not isinstance(items, list) or not items:
+        raise OrderImportError("items must be a non-empty list")
+
+    lines = []
+    total = Decimal("0")
+    for n, item in enumerate(items):
+        name, quantity, customization = _item(item, n)
+        product = products.get(normalize_name(name))
+        if product is None:
+            raise OrderImportError(f"items[{n}]: unknown product {name!r}")
+        if not product.available:
+            raise OrderImportError(f"items[{n}]: {name!r} is not available")
+
+        unit_price = Decimal(product.price)
+        lines.append(cart_line(name, quantity, customization, unit_price))
+        total += unit_price * quantity
+
+    session_id = raw.get("session_id")
+    return {
+        "platform": platform,
+        "session_id": None if session_id is None else str(session_id),
+        "items": lines,
+        "price": total,
+        "status": "confirmed",
+        "created_at": _created_at(raw.get("created_at")),
+    }
+
+
+async def _insert_rows(db: AsyncSession, chunk: List[Tuple[int, dict]], errors: List[dict]) -> List[int]:
+    """Row-by-row fallback for a chunk that failed, to pin the error on its rows."""
+    inserted = []
+    for row, values in chunk:
+        for attempt in range(2):
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(Orders.__table__).values(values))
+            except IntegrityError as e:
+                # An order_id that already exists: draw a new one once
+                if attempt == 0:
+                    values["order_id"] = generate_order_id()
+                    continue
+                errors.append({"row": row, "error": f"insert failed: {type(e.orig).__name__}"})
+            except SQLAlchemyError as e:
+                errors.append({"row": row, "error": f"insert failed: {type(getattr(e, 'orig', e)).__name__}"})
+            else:
+                inserted.append(row)
+            break
+    await db.commit()
+    return inserted
+
+
+async def _insert_chunk(db: AsyncSession, chunk: List[Tuple[int, dict]], errors: List[dict]) -> List[int]:
+    try:
+        # One executemany: batched into multi-row INSERTs by the dialect
+        await db.execute(insert(Orders.__table__), [values for _, values in chunk])
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        logger.warning("order import chunk failed, retrying row by row",
+                       extra={"rows": len(chunk)}, exc_info=True)
+        return await _insert_rows(db, chunk, errors)
+    return [row for row, _ in chunk]
+
+
+async def import_orders(
+    db: AsyncSession,
+    orders: Sequence,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Validates and inserts confirmed orders in bulk (back office imports of
+    phone and vendor-app orders).
+
+    All rows are checked against one catalog snapshot first; rows that
+    fail are reported and skipped, the rest are inserted in transactions
+    of `chunk_size` rows. `order_ids[i]` is the id given to orders[i], or
+    None when it was rejected; `errors` lists {"row": i, "error": ...}.
+    """
+    chunk_size = chunk_size or settings.ORDER_IMPORT_CHUNK
+    start = time.perf_counter()
+
+    products = await catalog.get_many(db, requested_names(orders))
+
+    errors: List[dict] = []
+    pending: List[Tuple[int, dict]] = []
+    seen_ids = set()
+    for row, raw in enumerate(orders):
+        try:
+            values = parse_order(raw, products)
+        except OrderImportError as e:
+            errors.append({"row": row, "error": str(e)})
+            continue
+
+        order_id = generate_order_id()
+        while order_id in seen_ids:
+            order_id = generate_order_id()
+        seen_ids.add(order_id)
+        values["order_id"] = order_id
+        pending.append((row, values))
+
+    order_ids: List[Optional[str]] = [None] * len(orders)
+    by_row = dict(pending)
+    for i in range(0, len(pending), chunk_size):
+        for row in await _insert_chunk(db, pending[i:i + chunk_size], errors):
+            order_ids[row] = by_row[row]["order_id"]
+
+    errors.sort(key=lambda e: e["row"])
+    inserted = len(orders) - len(errors)
+    seconds = time.perf_counter() - start
+    logger.info("orders imported", extra={
+        "received": len(orders), "inserted": inserted, "failed": len(errors),
+        "seconds": round(seconds, 3),
+    })
+    return {
+        "received": len(orders),
+        "inserted": inserted,
+        "failed": len(errors),
+        "seconds": round(seconds, 3),
+        "order_ids": order_ids,
+        "errors": errors,
+    }
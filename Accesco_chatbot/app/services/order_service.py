@@ -1,20 +1,46 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from decimal import Decimal
-import uuid
 from typing import Union, List, Dict, Any
 
 from Accesco_chatbot.app.models.orders import Orders
-from Accesco_chatbot.app.models.ingredients import Ingredient
-from Accesco_chatbot.app.models.products import Products
-from Accesco_chatbot.app.models.temp_cart import TempCart
+from Accesco_chatbot.app.services.cart_store import cart_store
+from Accesco_chatbot.app.services.catalog_service import catalog, normalize_name
+from Accesco_chatbot.app.services.ingredient_pricing import CustomDish, ingredient_index
+from Accesco_chatbot.app.services.order_status import OrderStatus, order_status
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+from Accesco_chatbot.app.utils.ids import new_order_id, normalize_order_id
+from Accesco_chatbot.app.utils.responses import Card, Fulfillment
 
 
 # -------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------
 def generate_order_id() -> str:
-    return str(uuid.uuid4())[:10].upper()
+    return new_order_id()
+
+
+# Fresh IDs tried when an order_id is already taken
+ORDER_ID_ATTEMPTS = 3
+
+
+async def insert_order(db: AsyncSession, order: Orders):
+    """
+    Adds `order`, drawing a new order_id if the one it has is taken: two
+    workers that share an ID node can issue the same ID in the same
+    millisecond. The INSERT runs in a savepoint, so a collision leaves the
+    rest of the transaction (the popped Postgres cart) intact.
+    """
+    for attempt in range(ORDER_ID_ATTEMPTS):
+        try:
+            async with db.begin_nested():
+                db.add(order)
+            return
+        except IntegrityError:
+            if attempt == ORDER_ID_ATTEMPTS - 1:
+                raise
+            order.order_id = generate_order_id()
 
 
 def _find_order_context_name(platform: str) -> str:
@@ -25,68 +51,64 @@ def _find_order_context_name(platform: str) -> str:
     return "default-order"
 
 
+def cart_line(item: str, quantity: int, customization, unit_price: Decimal) -> Dict[str, Any]:
+    """One priced line as stored in carts and in orders.items."""
+    return {
+        "item": item,
+        "quantity": quantity,
+        "customization": customization,
+        "unit_price": float(unit_price),
+        "total_price": float(unit_price * quantity)
+    }
+
+
 DEFAULT_INGREDIENT_IMAGE = "https://accesco.co.in/images/default-ingredient.png"
 
 
 # -------------------------------------------------------------
 # Rich Content Builders (df-messenger compatible)
 # -------------------------------------------------------------
-def build_product_rich_cards(items: list, db: Session) -> list:
+async def build_product_rich_cards(items: list, db: AsyncSession) -> List[Card]:
     """
     Builds richContent cards for products
     """
     rich_cards = []
+    products = await catalog.get_many(db, (item["item"] for item in items))
 
     for item in items:
-        product = db.query(Products).filter(Products.name == item["item"]).first()
+        product = products.get(normalize_name(item["item"]))
         if not product or not product.image_url:
             continue
 
-        rich_cards.append([
-            {
-                "type": "image",
-                "rawUrl": product.image_url,
-                "accessibilityText": item["item"]
-            },
-            {
-                "type": "info",
-                "title": item["item"].title(),
-                "subtitle": f"Qty: {item['quantity']} | ₹{item['total_price']}"
-            }
-        ])
+        rich_cards.append(Card(
+            product.image_url,
+            item["item"],
+            f"Qty: {item['quantity']} | ₹{item['total_price']}",
+        ))
 
     return rich_cards
 
 
-def build_ingredient_rich_cards(ingredient_rows: list) -> list:
-    cards = []
-    for ing in ingredient_rows:
-        cards.append([
-            {
-                "type": "image",
-                "rawUrl": ing.image_url or DEFAULT_INGREDIENT_IMAGE,
-                "accessibilityText": ing.name
-            },
-            {
-                "type": "info",
-                "title": ing.name.title(),
-                "subtitle": f"₹{ing.price}"
-            }
-        ])
-    return cards
+def build_ingredient_rich_cards(ingredient_rows: list) -> List[Card]:
+    return [
+        Card(ing.image_url or DEFAULT_INGREDIENT_IMAGE, ing.name, f"₹{ing.price}")
+        for ing in ingredient_rows
+    ]
 
 
 # -------------------------------------------------------------
 # ADD ITEM (TEMP CART + RICH CONTENT)
 # -------------------------------------------------------------
-def handle_add_item(
-    body: dict,
-    db: Session,
+async def handle_add_item(
+    req: DialogflowRequest,
+    db: AsyncSession,
     platform: str,
     item_param: Union[str, List[str]]
 ) -> Dict[str, Any]:
 
-    params = body.get("queryResult", {}).get("parameters", {}) or {}
+    # Items, quantities and customizations are this turn's slots only:
+    # follow-up contexts still carry the previous turn's items
+    params = req.parameters
 
     # 1) Extract items
     items = []
@@ -115,165 +137,88 @@ def handle_add_item(
     while len(customizations) < len(items):
         customizations.append(None)
 
-    # 4) Session & cart
-    session_id = body.get("session", "").split("/")[-1]
-
-    cart = (
-        db.query(TempCart)
-        .filter(
-            TempCart.session_id == session_id,
-            TempCart.status == "ACTIVE"
-        )
-        .first()
-    )
+    # 4) Session
+    session_id = req.session_id
 
-    cart_items = list(cart.cart_items) if cart else []
+    # 5) Price requested lines
+    products = await catalog.get_many(db, items)
 
-    # 5) Merge items
+    lines = []
     for item_name, qty, cust in zip(items, qtys, customizations):
-        product = (
-            db.query(Products)
-            .filter(
-                Products.name == item_name,
-                Products.available == True
-            )
-            .first()
-        )
-        if not product:
+        product = products.get(normalize_name(item_name))
+        if not product or not product.available:
             continue
 
-        unit_price = Decimal(product.price)
-        quantity = int(qty)
-
-        merged = False
-        for item in cart_items:
-            if item["item"] == item_name and item.get("customization") == cust:
-                item["quantity"] = quantity
-                item["total_price"] = float(unit_price * quantity)
-                merged = True
-                break
-
-        if not merged:
-            cart_items.append({
-                "item": item_name,
-                "quantity": quantity,
-                "customization": cust,
-                "unit_price": float(unit_price),
-                "total_price": float(unit_price * quantity)
-            })
-
-    # 6) Recalculate total
-    total_price = sum(Decimal(str(i["total_price"])) for i in cart_items)
+        lines.append(cart_line(item_name, int(qty), cust, Decimal(product.price)))
 
-    # 7) Persist cart
-    if not cart:
-        cart = TempCart(
-            session_id=session_id,
-            cart_items=cart_items,
-            total_price=float(total_price),
-            status="ACTIVE",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        db.add(cart)
-    else:
-        cart.cart_items = cart_items
-        cart.total_price = float(total_price)
-        cart.updated_at = datetime.utcnow()
+    # 6) Merge into the cart and recalculate total (single statement)
+    cart_items, total_price = await cart_store.merge_lines(db, session_id, lines)
 
-    db.commit()
+    # 7) Persist cart
+    await db.commit()
 
     # 8) Build rich content
-    rich_cards = build_product_rich_cards(cart_items, db)
+    rich_cards = await build_product_rich_cards(cart_items, db)
 
-    return {
-        "fulfillmentText": "Item added to your cart.",
-        "fulfillmentMessages": [
-            {
-                "payload": {
-                    "richContent": rich_cards
-                }
-            },
-            {
-                "text": {
-                    "text": [
-                        "✅ Item added to your cart.\nWould you like to add more items?"
-                    ]
-                }
-            }
-        ]
-    }
+    return Fulfillment(
+        "Item added to your cart.",
+        rich_cards,
+        "✅ Item added to your cart.\nWould you like to add more items?",
+    ).render()
 
 
 # -------------------------------------------------------------
 # CONFIRM ORDER
 # -------------------------------------------------------------
-def handle_confirm_order(body: dict, db: Session, platform: str) -> Dict[str, Any]:
+async def handle_confirm_order(req: DialogflowRequest, db: AsyncSession, platform: str) -> Dict[str, Any]:
 
-    session_id = body.get("session", "").split("/")[-1]
+    session_id = req.session_id
 
-    cart = (
-        db.query(TempCart)
-        .filter(
-            TempCart.session_id == session_id,
-            TempCart.status == "ACTIVE"
-        )
-        .first()
-    )
+    cart = await cart_store.pop(db, session_id)
 
-    if not cart or not cart.cart_items:
+    if not cart or not cart[0]:
         return {"fulfillmentText": "Your cart is empty. Please add items before confirming."}
 
+    cart_items, total_price = cart
+
     order = Orders(
         order_id=generate_order_id(),
         platform=platform,
         session_id=session_id,
-        items=cart.cart_items,
-        price=cart.total_price,
+        items=cart_items,
+        price=total_price,
         status="confirmed",
         created_at=datetime.utcnow(),
     )
 
-    db.add(order)
-    db.delete(cart)
-    db.commit()
+    try:
+        await insert_order(db, order)
+        await db.commit()
+    except Exception:
+        # Memory / redis carts are gone once popped: put the cart back so
+        # the retried turn doesn't find it empty
+        await db.rollback()
+        await cart_store.restore(db, session_id, cart_items)
+        raise
 
-    rich_cards = build_product_rich_cards(order.items, db)
+    order_status.put(OrderStatus.build(order.order_id, order.status, order.items, order.created_at))
 
-    return {
-        "fulfillmentText": (
-            f"🎉 Your {platform} order has been confirmed!\n"
-            f"💰 Total Amount: ₹{order.price}\n"
-            f"📦 Order ID: {order.order_id}"
-        ),
-        "fulfillmentMessages": [
-            {
-                "payload": {
-                    "richContent": rich_cards
-                }
-            },
-            {
-                "text": {
-                    "text": [
-                        (
-                            f"🎉 Your {platform} order has been confirmed!\n"
-                            f"💰 Total Amount: ₹{order.price}\n"
-                            f"📦 Order ID: {order.order_id}"
-                        )
-                    ]
-                }
-            }
-        ]
-    }
+    rich_cards = await build_product_rich_cards(order.items, db)
+
+    return Fulfillment(
+        f"🎉 Your {platform} order has been confirmed!\n"
+        f"💰 Total Amount: ₹{order.price}\n"
+        f"📦 Order ID: {order.order_id}",
+        rich_cards,
+    ).render()
 
 
 # -------------------------------------------------------------
 # CREATE / MERGE CUSTOM FOOD (RICH CONTENT)
 # -------------------------------------------------------------
-def handle_create_custom_food(body: dict, db: Session, platform: str) -> Dict[str, Any]:
+async def handle_create_custom_food(req: DialogflowRequest, db: AsyncSession, platform: str) -> Dict[str, Any]:
 
-    params = body.get("queryResult", {}).get("parameters", {}) or {}
-    ingredients = params.get("ingredients", [])
+    ingredients = req.parameters.get("ingredients", [])
 
     if not ingredients:
         return {"fulfillmentText": "Please tell me which ingredients you want."}
@@ -281,119 +226,82 @@ def handle_create_custom_food(body: dict, db: Session, platform: str) -> Dict[st
     ingredients = ingredients if isinstance(ingredients, list) else [ingredients]
     ingredients = [i.lower() for i in ingredients]
 
-    session_id = body.get("session", "").split("/")[-1]
-
-    cart = (
-        db.query(TempCart)
-        .filter(
-            TempCart.session_id == session_id,
-            TempCart.status == "ACTIVE"
-        )
-        .first()
-    )
+    session_id = req.session_id
 
-    if not cart:
-        cart = TempCart(
-            session_id=session_id,
-            cart_items=[],
-            total_price=0,
-            status="ACTIVE",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        db.add(cart)
-        db.flush()
-
-    cart_items = list(cart.cart_items)
-
-    ingredient_rows = (
-        db.query(Ingredient)
-        .filter(Ingredient.name.in_(ingredients))
-        .all()
-    )
+    # Served from the in-memory price index: no query while it is fresh
+    found = await ingredient_index.get_many(db, ingredients)
+    requested = [found[k] for k in map(normalize_name, ingredients) if k in found]
 
-    if not ingredient_rows:
+    if not requested:
         return {"fulfillmentText": "Sorry, none of those ingredients are available."}
 
-    added_price = sum(Decimal(i.price) for i in ingredient_rows)
+    result = {}
 
-    idx = next((i for i, x in enumerate(cart_items) if x.get("item") == "custom dish"), None)
+    def merge_custom_dish(cart_items: list) -> list:
+        idx = next((i for i, x in enumerate(cart_items) if x.get("item") == "custom dish"), None)
 
-    if idx is not None:
-        old = cart_items[idx]
-        merged_ingredients = list(set(old.get("ingredients", [])) | set(ingredients))
-        new_price = Decimal(str(old["unit_price"])) + added_price
+        if idx is not None:
+            old = cart_items[idx]
+            dish = CustomDish.from_line(old)
+            result["action"] = "updated"
+        else:
+            old = {"item": "custom dish", "quantity": 1, "customization": None}
+            dish = CustomDish()
+            idx = len(cart_items)
+            cart_items.append(old)
+            result["action"] = "created"
 
+        # Only the new ingredients are priced; ones already in the dish are not charged again
+        dish.add(requested)
         cart_items[idx] = {
             **old,
-            "ingredients": merged_ingredients,
-            "unit_price": float(new_price),
-            "total_price": float(new_price)
+            "ingredients": dish.ingredients,
+            "unit_price": float(dish.price),
+            "total_price": float(dish.price)
         }
-        action = "updated"
-    else:
-        cart_items.append({
-            "item": "custom dish",
-            "quantity": 1,
-            "ingredients": ingredients,
-            "customization": None,
-            "unit_price": float(added_price),
-            "total_price": float(added_price)
-        })
-        action = "created"
-
-    cart.cart_items = cart_items
-    cart.total_price = sum(Decimal(str(i["total_price"])) for i in cart_items)
-    cart.updated_at = datetime.utcnow()
-    db.commit()
-
-    ingredient_cards = build_ingredient_rich_cards(ingredient_rows)
+        result["dish"] = dish
+        return cart_items
 
-    return {
-        "fulfillmentText": "Custom dish updated.",
-        "fulfillmentMessages": [
-            {
-                "payload": {
-                    "richContent": ingredient_cards
-                }
-            },
-            {
-                "text": {
-                    "text": [
-                        (
-                            f"🍽️ Custom dish {action}!\n"
-                            f"Ingredients: {', '.join(ingredients)}\n"
-                            f"💰 Price: ₹{cart.cart_items[-1]['total_price']}\n\n"
-                            "Would you like to add more items?"
-                        )
-                    ]
-                }
-            }
-        ]
-    }
+    # Atomic read-modify-write: concurrent turns can't lose the update
+    await cart_store.update(db, session_id, merge_custom_dish)
+    await db.commit()
+
+    dish = result["dish"]
+    ingredient_cards = build_ingredient_rich_cards(list({e.key: e for e in requested}.values()))
+
+    return Fulfillment(
+        "Custom dish updated.",
+        ingredient_cards,
+        f"🍽️ Custom dish {result['action']}!\n"
+        f"Ingredients: {', '.join(dish.ingredients)}\n"
+        f"💰 Price: ₹{float(dish.price)}\n\n"
+        "Would you like to add more items?",
+    ).render()
 
 
 # -------------------------------------------------------------
 # TRACK ORDER
 # -------------------------------------------------------------
-def handle_track_order(body: dict, db: Session) -> str:
+async def handle_track_order(req: DialogflowRequest, db: AsyncSession) -> str:
 
-    params = body.get("queryResult", {}).get("parameters", {}) or {}
-    order_id = params.get("order_id")
+    order_id = req.param("order_id")
 
     if not order_id:
         return "Please provide a valid order ID."
 
-    order = db.query(Orders).filter(Orders.order_id == order_id).first()
-    if not order:
+    # Malformed IDs can't match an order: answered without a query
+    canonical = normalize_order_id(order_id)
+    if canonical is None:
         return f"No order found with ID {order_id}."
 
-    items = ", ".join(f"{i['quantity']} {i['item']}" for i in order.items)
-    created = order.created_at.strftime("%Y-%m-%d %H:%M")
+    # Users ask again and again: served from the read model when possible
+    order = await order_status.get(db, canonical)
+    if not order:
+        return f"No order found with ID {order_id}."
 
     return (
         f"📦 Order {order.order_id}\n"
         f"Status: {order.status}\n"
-        f"Items: {items}\n"
-        f"Created at: {created}"
+        f"Items: {order.summary}\n"
+        f"Created at: {order.created}"
     )
@@ -0,0 +1,151 @@
+# app/services/order_status.py
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.models.orders import Orders
+
+
+def items_summary(items: Optional[List[Dict[str, Any]]]) -> str:
+    return ", ".join(f"{i['quantity']} {i['item']}" for i in items or [])
+
+
+class OrderStatus:
+    """What tracking needs from an order, with the items string prebuilt."""
+
+    __slots__ = ("order_id", "status", "summary", "created")
+
+    def __init__(self, order_id: str, status: str, summary: str, created: str):
+        self.order_id = order_id
+        self.status = status
+        self.summary = summary
+        self.created = created
+
+    @classmethod
+    def build(cls, order_id: str, status: str, items, created_at: datetime) -> "OrderStatus":
+        return cls(order_id, status, items_summary(items), created_at.strftime("%Y-%m-%d %H:%M"))
+
+    def with_status(self, status: str) -> "OrderStatus":
+        return OrderStatus(self.order_id, status, self.summary, self.created)
+
+
+class OrderStatusCache:
+    """
+    Read model for order tracking, keyed by order_id.
+
+    Entries are written when an order is confirmed and updated when its
+    status changes in this process. `ttl` bounds how stale an entry can be
+    when another worker changed the order; `max_entries` bounds memory
+    (least recently used go first).
+
+    A miss may read the order just before this process commits a status
+    change for it. Changes made while misses are querying are therefore
+    recorded (status, or None when invalidated), and a miss whose order
+    changed meanwhile caches the new status, or nothing, instead of the
+    row it read.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # Change counter, and the changes since the oldest running miss
+        self._version = 0
+        self._loading = 0
+        self._changed: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._cleared_at = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def put(self, entry: OrderStatus):
+        if not self.enabled:
+            return
+        self._entries[entry.order_id] = (time.monotonic() + self.ttl, entry)
+        self._entries.move_to_end(entry.order_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record_change(self, order_id: str, status: Optional[str]):
+        self._version += 1
+        if self._loading:
+            self._changed[order_id] = (self._version, status)
+
+    def set_status(self, order_id: str, status: str):
+        """Call after the status change is committed."""
+        self._record_change(order_id, status)
+        cached = self._entries.get(order_id)
+        if cached is not None:
+            self.put(cached[1].with_status(status))
+
+    def invalidate(self, order_id: str = None):
+        if order_id is None:
+            self._version += 1
+            self._cleared_at = self._version
+            self._entries.clear()
+        else:
+            self._record_change(order_id, None)
+            self._entries.pop(order_id, None)
+
+    async def get(self, db: AsyncSession, order_id: str) -> Optional[OrderStatus]:
+        cached = self._entries.get(order_id)
+        if cached is not None:
+            expires_at, entry = cached
+            if expires_at > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(order_id)
+                return entry
+            del self._entries[order_id]
+
+        self.misses += 1
+        started = self._version
+        self._loading += 1
+        try:
+            row = (
+                await db.execute(
+                    select(Orders.order_id, Orders.status, Orders.items, Orders.created_at)
+                    .where(Orders.order_id == order_id)
+                )
+            ).first()
+        finally:
+            self._loading -= 1
+            change = self._changed.get(order_id)
+            if not self._loading:
+                self._changed.clear()
+        if row is None:
+            return None
+
+        entry = OrderStatus.build(row.order_id, row.status, row.items, row.created_at)
+        if change is not None and change[0] > started:
+            # Changed while the query ran: the row may predate the change
+            if change[1] is None:
+                return entry
+            entry = entry.with_status(change[1])
+        elif self._cleared_at > started:
+            return entry
+        self.put(entry)
+        return entry
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+order_status = OrderStatusCache(
+    ttl=settings.ORDER_STATUS_TTL,
+    max_entries=settings.ORDER_STATUS_MAX_ENTRIES,
+)
@@ -0,0 +1,221 @@
+# app/services/product_search.py
+import heapq
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.services.catalog_service import ProductEntry, catalog, normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+def trigrams(value: str) -> Set[str]:
+    """Word trigrams padded the way pg_trgm does ("  w", " wo", ..., "rd ")."""
+    grams = set()
+    for word in normalize_name(value).split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def _similarity(shared: int, q: int, size: int) -> float:
+    """Mostly coverage of the query's trigrams, partly shared / union."""
+    return (2 * shared / q + shared / (q + size - shared)) / 3
+
+
+def escape_like(value: str) -> str:
+    """`value` as a literal inside a LIKE / ILIKE pattern (escape character \\)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FuzzyProductIndex:
+    """
+    In-memory product search built in two levels:
+
+      1. each query word is fuzzy-matched against the catalog vocabulary
+         with a trigram index, so "panner", "chiken" or "biryni" still
+         resolve to real words;
+      2. products containing the matched words are found by intersecting
+         per-word posting sets, shortest product names first.
+
+    Vocabulary lookups touch only the (small) set of distinct words, and
+    ranking stops as soon as k products are found, so lookups stay
+    sub-millisecond even for very large catalogs. Long messages are cut to
+    max_query_words, and word combinations are beam-searched, keeping the
+    best max_combos after each word rather than all 3^n of them.
+    """
+
+    max_alternatives = 3
+    max_query_words = 12
+    max_combos = 32
+
+    def __init__(self, entries: Sequence[ProductEntry], min_coverage: float = 0.5):
+        self.entries = list(entries)
+        self.min_coverage = min_coverage
+
+        word_docs: Dict[str, List[int]] = {}
+        name_sizes = []
+        for doc_id, entry in enumerate(self.entries):
+            words = normalize_name(entry.name).split()
+            name_sizes.append(len(" ".join(words)))
+            for w in set(words):
+                word_docs.setdefault(w, []).append(doc_id)
+
+        # Shorter names first: the closest match for the same words
+        by_rank = sorted(range(len(self.entries)), key=lambda d: (name_sizes[d], d))
+        self._rank = [0] * len(self.entries)
+        for rank, doc_id in enumerate(by_rank):
+            self._rank[doc_id] = rank
+        self._doc_order = {
+            w: sorted(ids, key=self._rank.__getitem__) for w, ids in word_docs.items()
+        }
+        self._doc_sets = {w: frozenset(ids) for w, ids in word_docs.items()}
+
+        self._vocab = list(word_docs)
+        self._vocab_sizes = []
+        gram_words: Dict[str, List[int]] = {}
+        for word_id, w in enumerate(self._vocab):
+            grams = trigrams(w)
+            self._vocab_sizes.append(len(grams))
+            for g in grams:
+                gram_words.setdefault(g, []).append(word_id)
+        self._gram_words = {g: tuple(ids) for g, ids in gram_words.items()}
+
+    def match_word(self, word: str) -> List[Tuple[float, str]]:
+        """Best vocabulary words for one query word, as (score, word)."""
+        if word in self._doc_sets:
+            return [(1.0, word)]
+
+        grams = trigrams(word)
+        if not grams:
+            return []
+
+        shared = Counter()
+        for g in grams:
+            ids = self._gram_words.get(g)
+            if ids:
+                shared.update(ids)
+
+        q = len(grams)
+        needed = self.min_coverage * q
+        scored = (
+            (_similarity(c, q, self._vocab_sizes[word_id]), self._vocab[word_id])
+            for word_id, c in shared.items()
+            if c >= needed
+        )
+        return heapq.nlargest(self.max_alternatives, scored)
+
+    def _take(self, words: Tuple[str, ...], limit: int, seen: Set[int]) -> List[int]:
+        """Up to `limit` unseen products containing all `words`, shortest first."""
+        sets = [self._doc_sets[w] for w in words]
+        smallest = min(range(len(words)), key=lambda i: len(sets[i]))
+        ordered = self._doc_order[words[smallest]]
+
+        if len(words) > 1:
+            common = frozenset.intersection(*sets)
+            if not common:
+                return []
+            if len(common) * 8 < len(ordered):
+                # Sparse overlap: rank the (small) intersection directly
+                return heapq.nsmallest(limit, common - seen, key=self._rank.__getitem__)
+        else:
+            common = sets[0]
+
+        # Dense overlap: walk the postings in rank order and stop early
+        found = []
+        for doc_id in ordered:
+            if doc_id in common and doc_id not in seen:
+                found.append(doc_id)
+                if len(found) == limit:
+                    break
+        return found
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[float, ProductEntry]]:
+        query_words = normalize_name(query).split()[:self.max_query_words]
+        alternatives = [m for m in (self.match_word(w) for w in query_words) if m]
+        if not alternatives:
+            return []
+
+        # Best combinations of per-word alternatives, best combined score
+        # first. Scores add up, so keeping the top max_combos prefixes after
+        # each word still yields exactly the top max_combos combinations.
+        combos = [((), 0.0)]
+        for alts in alternatives:
+            combos = heapq.nlargest(
+                self.max_combos,
+                ((words + (w,), score + s) for words, score in combos for s, w in alts),
+                key=lambda c: c[1],
+            )
+
+        n = len(alternatives)
+        results: List[Tuple[float, ProductEntry]] = []
+        seen: Set[int] = set()
+        for words, score in combos:
+            for doc_id in self._take(words, k - len(results), seen):
+                seen.add(doc_id)
+                results.append((round(score / n, 4), self.entries[doc_id]))
+            if len(results) == k:
+                break
+
+        if not results and n > 1:
+            # No product has all the words: best single-word matches instead
+            best = max(alternatives, key=lambda alts: alts[0][0])
+            return self.search(best[0][1], k)
+        return results
+
+
+class ProductSearch:
+    def __init__(self, backend: str):
+        self.backend = backend
+        self._index: Optional[FuzzyProductIndex] = None
+        self._index_version = -1
+
+    async def _memory_index(self, db: AsyncSession) -> FuzzyProductIndex:
+        entries = await catalog.entries(db)
+        if self._index is None or self._index_version != catalog.version:
+            self._index = FuzzyProductIndex(entries)
+            self._index_version = catalog.version
+        return self._index
+
+    async def _search_postgres(self, db: AsyncSession, query: str, k: int) -> List[Tuple[float, ProductEntry]]:
+        rows = (
+            await db.execute(
+                text(
+                    "SELECT name, price, available, image_url, similarity(name, :q) AS score "
+                    "FROM products "
+                    "WHERE name % :q OR name ILIKE :pattern ESCAPE '\\' "
+                    "ORDER BY score DESC, available DESC, id "
+                    "LIMIT :k"
+                ),
+                {"q": query, "pattern": f"%{escape_like(query)}%", "k": k},
+            )
+        ).all()
+        return [
+            (round(float(r.score), 4), ProductEntry(r.name, r.price, bool(r.available), r.image_url))
+            for r in rows
+        ]
+
+    async def search(self, db: AsyncSession, query: str, k: int = 5) -> List[Tuple[float, ProductEntry]]:
+        """Top-k (score, product) pairs, best first."""
+        if self.backend == "postgres" or not catalog.enabled:
+            try:
+                return await self._search_postgres(db, query, k)
+            except DBAPIError:
+                # pg_trgm missing on this server: use the in-memory index from now on
+                await db.rollback()
+                if not catalog.enabled:
+                    raise
+                logger.warning("pg_trgm search failed, switching to the in-memory index", exc_info=True)
+                self.backend = "memory"
+
+        index = await self._memory_index(db)
+        return index.search(query, k=k)
+
+
+product_search = ProductSearch(backend=settings.PRODUCT_SEARCH_BACKEND)
@@ -1,11 +1,11 @@
-from sqlalchemy.orm import Session
-from Accesco_chatbot.app.models.products import Products
+from sqlalchemy.ext.asyncio import AsyncSession
+from Accesco_chatbot.app.services.product_search import product_search
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
 
-def handle_product_queries(body, db: Session):
+async def handle_product_queries(req: DialogflowRequest, db: AsyncSession):
 
     # Extract parameters from Dialogflow ES
-    params = body["queryResult"].get("parameters", {})
-    product_name = params.get("product")
+    product_name = req.parameters.get("product")
 
     if not product_name:
         return "Please tell me which product you're looking for."
@@ -14,14 +14,18 @@ def handle_product_queries(body, db: Session):
     if isinstance(product_name, list):
         product_name = product_name[0]
 
-    # Query database for matching product
-    product = db.query(Products).filter(
-        Products.name.ilike(f"%{product_name}%")
-    ).first()
+    # Ranked fuzzy search (tolerates misspellings from Dialogflow)
+    results = await product_search.search(db, product_name, k=3)
 
-    if not product:
+    if not results:
         return f"Sorry, I couldn't find any product matching '{product_name}'."
 
+    _, product = results[0]
     availability_text = "available" if product.available else "unavailable"
+    reply = f"{product.name} costs ₹{product.price} and is {availability_text}."
 
-    return f"{product.name} costs ₹{product.price} and is {availability_text}."
+    others = [p.name for _, p in results[1:]]
+    if others:
+        reply += f"\nSimilar products: {', '.join(others)}."
+
+    return reply
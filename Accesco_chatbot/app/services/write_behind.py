@@ -0,0 +1,195 @@
+# app/services/write_behind.py
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE classes for rows the server will never accept: data exceptions
+# (value too long, bad format) and integrity violations. asyncpg raises
+# some of them as a plain DBAPIError, so the class is checked too.
+REJECTED_SQLSTATE_CLASSES = ("22", "23")
+
+
+def _sqlstate(e: DBAPIError) -> str:
+    return str(getattr(e.orig, "sqlstate", None) or "")
+
+
+def is_rejected(e: DBAPIError) -> bool:
+    return isinstance(e, (DataError, IntegrityError)) or _sqlstate(e)[:2] in REJECTED_SQLSTATE_CLASSES
+
+
+class WriteBehindBuffer:
+    """
+    In-process buffer for inserts nobody reads back right away (cancel
+    feedback, analytics events). Rows are written as multi-row INSERTs,
+    one per table and up to `batch_size` rows, once `batch_size` rows are
+    waiting or every `interval` seconds, and on shutdown.
+
+    At most `max_queue` rows are held; beyond that add() drops the row and
+    counts it, so a database outage cannot grow memory without bound.
+
+    A chunk that fails is retried row by row: rows the database rejects
+    (data or integrity errors) are dropped, counted and logged, so one
+    bad row cannot block its table; rows that failed for any other reason
+    (connection lost, server down) stay queued for the next flush.
+    """
+
+    def __init__(self, batch_size: int, interval: float, max_queue: int):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_queue = max_queue
+
+        self._rows: Dict[Table, List[dict]] = {}
+        self._depth = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def add(self, table: Table, row: dict) -> bool:
+        if self._depth >= self.max_queue:
+            self.dropped += 1
+            return False
+
+        self._rows.setdefault(table, []).append(row)
+        self._depth += 1
+        self.enqueued += 1
+
+        if self._task is None or self._task.done():
+            self.start()
+        if self._depth >= self.batch_size:
+            self._wake.set()
+        return True
+
+    async def _insert_rows(self, table: Table, rows: List[dict]) -> Tuple[int, List[dict]]:
+        """
+        Row-by-row fallback for a chunk that failed. Rows the database
+        rejects are dropped; returns the rows written and, if the database
+        failed otherwise, the rows to keep for the next flush.
+        """
+        kept = []
+        i = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                for i, row in enumerate(rows):
+                    try:
+                        async with db.begin_nested():
+                            await db.execute(insert(table).values(row))
+                    except DBAPIError as e:
+                        if not is_rejected(e):
+                            raise
+                        self.rejected += 1
+                        self.last_error = str(e)
+                        logger.warning("write-behind row rejected",
+                                       extra={"table": table.name, "sqlstate": _sqlstate(e)})
+                    else:
+                        kept.append(row)
+                i = len(rows)
+                await db.commit()
+        except Exception as e:
+            # Nothing of this chunk was committed: keep what wasn't rejected
+            self.failed_flushes += 1
+            self.last_error = str(e)
+            logger.warning("write-behind flush failed", exc_info=True,
+                           extra={"table": table.name, "rows": len(kept) + len(rows) - i})
+            return 0, kept + rows[i:]
+        return len(kept), []
+
+    async def flush(self) -> int:
+        if not self._rows:
+            return 0
+
+        pending, self._rows, self._depth = self._rows, {}, 0
+        start = time.perf_counter()
+        written = 0
+
+        for table, rows in pending.items():
+            for i in range(0, len(rows), self.batch_size):
+                chunk = rows[i:i + self.batch_size]
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(insert(table).values(chunk))
+                        await db.commit()
+                except Exception:
+                    logger.warning("write-behind chunk failed, retrying row by row",
+                                   extra={"table": table.name, "rows": len(chunk)})
+                    chunk_written, unwritten = await self._insert_rows(table, chunk)
+                    written += chunk_written
+                    if unwritten:
+                        # Keep the unwritten rows (ahead of anything added since) for the next flush
+                        unwritten += rows[i + len(chunk):]
+                        self._rows[table] = unwritten + self._rows.get(table, [])
+                        self._depth += len(unwritten)
+                        break
+                else:
+                    written += len(chunk)
+
+        self.written += written
+        self.flushes += 1
+        self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+        return written
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stops the flusher after a last flush of everything buffered."""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "depth": self._depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": self.last_flush_ms,
+            "last_error": self.last_error,
+        }
+
+
+write_behind = WriteBehindBuffer(
+    batch_size=settings.WRITE_BEHIND_BATCH,
+    interval=settings.WRITE_BEHIND_INTERVAL,
+    max_queue=settings.WRITE_BEHIND_MAX_QUEUE,
+)
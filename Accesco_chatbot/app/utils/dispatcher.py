@@ -0,0 +1,135 @@
+# app/utils/dispatcher.py
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class _TrieNode:
+    __slots__ = ("children", "route")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.route = None
+
+
+class IntentDispatcher:
+    """
+    Maps Dialogflow intent names to handlers.
+
+    Routes are matched in this order:
+      1. exact intent name (hash map)
+      2. longest registered prefix (trie walk over the intent name)
+      3. substring patterns (checked only when nothing above matched)
+
+    Intent names are lower-cased on registration and lookup.
+    Results are memoised per intent name, so a repeated intent costs a
+    single dict lookup.
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Callable] = {}
+        self._prefixes: List[Tuple[str, Callable, Optional[str]]] = []
+        self._contains: List[Tuple[str, Callable]] = []
+        self._root = _TrieNode()
+        self._resolved: Dict[str, Optional[Callable]] = {}
+        self._compiled = False
+
+    # ---------------------------------------------------------
+    # Registration
+    # ---------------------------------------------------------
+    def exact(self, *names: str):
+        def decorator(handler: Callable) -> Callable:
+            for name in names:
+                self._exact[name.lower()] = handler
+            self._compiled = False
+            return handler
+        return decorator
+
+    def prefix(self, *prefixes: str, unless: Optional[str] = None):
+        """
+        `unless` skips the route when the intent contains that substring,
+        so the lookup falls back to the next shorter prefix.
+        """
+        def decorator(handler: Callable) -> Callable:
+            for p in prefixes:
+                self._prefixes.append((p.lower(), handler, unless))
+            self._compiled = False
+            return handler
+        return decorator
+
+    def contains(self, *patterns: str):
+        def decorator(handler: Callable) -> Callable:
+            for p in patterns:
+                self._contains.append((p.lower(), handler))
+            self._compiled = False
+            return handler
+        return decorator
+
+    # ---------------------------------------------------------
+    # Compilation
+    # ---------------------------------------------------------
+    def compile(self) -> "IntentDispatcher":
+        root = _TrieNode()
+        for p, handler, unless in self._prefixes:
+            node = root
+            for ch in p:
+                node = node.children.setdefault(ch, _TrieNode())
+            node.route = (handler, unless)
+
+        self._root = root
+        self._resolved = {}
+        self._compiled = True
+        return self
+
+    def _match_prefix(self, intent: str) -> Optional[Callable]:
+        node = self._root
+        candidates = []
+        for ch in intent:
+            node = node.children.get(ch)
+            if node is None:
+                break
+            if node.route is not None:
+                candidates.append(node.route)
+
+        # Longest prefix first
+        for handler, unless in reversed(candidates):
+            if unless and unless in intent:
+                continue
+            return handler
+        return None
+
+    def _match(self, intent: str) -> Optional[Callable]:
+        handler = self._exact.get(intent)
+        if handler is not None:
+            return handler
+
+        handler = self._match_prefix(intent)
+        if handler is not None:
+            return handler
+
+        for pattern, handler in self._contains:
+            if pattern in intent:
+                return handler
+        return None
+
+    # ---------------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------------
+    def resolve(self, intent: str) -> Optional[Callable]:
+        if not self._compiled:
+            self.compile()
+
+        intent = intent.lower()
+        try:
+            return self._resolved[intent]
+        except KeyError:
+            handler = self._match(intent)
+            # Bound the memo so arbitrary intent names can't grow it forever
+            if len(self._resolved) < 4096:
+                self._resolved[intent] = handler
+            return handler
+
+    def routes(self) -> Dict[str, Any]:
+        return {
+            "exact": sorted(self._exact),
+            "prefix": [p for p, _, _ in self._prefixes],
+            "contains": [p for p, _ in self._contains],
+        }
@@ -1,15 +1,169 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from Accesco_chatbot.app.config import settings
+
+try:
+    import msgspec
+except ImportError:  # optional: orjson or the stdlib parser is used without it
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if settings.WEBHOOK_PARSER == "fast" and msgspec is not None:
+    PARSER = "msgspec"
+elif settings.WEBHOOK_PARSER == "fast" and orjson is not None:
+    PARSER = "orjson"
+else:
+    PARSER = "json"
+
+
+def loads(raw: bytes) -> Any:
+    """Decodes a JSON body with the configured parser; ValueError if malformed."""
+    if PARSER == "msgspec":
+        try:
+            return msgspec.json.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    if PARSER == "orjson":
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _as_dict(value) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+class DialogflowRequest:
+    """
+    A webhook call, parsed once and handed to every handler.
+
+    Only the fields the handlers use are pulled out of the body. A context
+    parameter is resolved across outputContexts once and then kept in an
+    index, so handlers asking for the same name again get a dict hit.
+    """
+
+    __slots__ = (
+        "session", "response_id", "intent", "parameters", "contexts",
+        "_context_index",
+    )
+
+    def __init__(
+        self,
+        session: str = "",
+        response_id: Optional[str] = None,
+        intent: str = "",
+        parameters: Optional[Dict[str, Any]] = None,
+        contexts: Optional[List[dict]] = None,
+    ):
+        self.session = session
+        self.response_id = response_id
+        self.intent = intent
+        self.parameters = parameters or {}
+        self.contexts = contexts or []
+        self._context_index: Dict[str, Any] = {}
+
+    @classmethod
+    def from_body(cls, body: dict) -> "DialogflowRequest":
+        query = _as_dict(body.get("queryResult"))
+        contexts = query.get("outputContexts")
+        return cls(
+            session=body.get("session") or "",
+            response_id=body.get("responseId"),
+            intent=_as_dict(query.get("intent")).get("displayName") or "",
+            parameters=_as_dict(query.get("parameters")),
+            contexts=contexts if isinstance(contexts, list) else [],
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "DialogflowRequest":
+        """
+        Parses a raw webhook body; ValueError if it is not a JSON object.
+
+        With msgspec only the fields above are decoded, the rest of the body
+        (fulfillmentMessages, originalDetectIntentRequest, ...) is skipped.
+        """
+        if PARSER == "msgspec":
+            try:
+                return cls._from_struct(_body_decoder.decode(raw))
+            except msgspec.ValidationError:
+                pass  # valid JSON of an unexpected shape: parse it leniently below
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+        body = loads(raw)
+        if not isinstance(body, dict):
+            raise ValueError("webhook body is not a JSON object")
+        return cls.from_body(body)
+
+    @classmethod
+    def _from_struct(cls, body) -> "DialogflowRequest":
+        query = body.queryResult
+        if query is None:
+            return cls(session=body.session or "", response_id=body.responseId)
+        return cls(
+            session=body.session or "",
+            response_id=body.responseId,
+            intent=(query.intent.displayName if query.intent else None) or "",
+            parameters=query.parameters,
+            contexts=query.outputContexts,
+        )
+
+    @property
+    def session_id(self) -> str:
+        return self.session.split("/")[-1]
+
+    def _context_value(self, name: str):
+        """The first non-empty value of `name` across output contexts, memoized."""
+        index = self._context_index
+        if name in index:
+            return index[name]
+
+        value = None
+        for ctx in self.contexts:
+            params = ctx.get("parameters") if isinstance(ctx, dict) else None
+            if isinstance(params, dict):
+                value = params.get(name)
+                if value:
+                    break
+        else:
+            value = None
+        index[name] = value
+        return value
+
+    def param(self, name: str, default=None):
+        """
+        This turn's parameter if set, else the value carried in a context
+        (follow-ups keep e.g. order_id there).
+        """
+        value = self.parameters.get(name)
+        if value:
+            return value
+        value = self._context_value(name)
+        return default if value is None else value
+
+
+if msgspec is not None:
+    # The subset of a Dialogflow ES WebhookRequest that DialogflowRequest reads
+    class _Intent(msgspec.Struct):
+        displayName: Optional[str] = None
+
+    class _QueryResult(msgspec.Struct):
+        intent: Optional[_Intent] = None
+        parameters: Optional[Dict[str, Any]] = None
+        outputContexts: Optional[List[Any]] = None
+
+    class _WebhookBody(msgspec.Struct):
+        session: Optional[str] = None
+        responseId: Optional[str] = None
+        queryResult: Optional[_QueryResult] = None
+
+    _body_decoder = msgspec.json.Decoder(_WebhookBody)
+
+
 def get_param(body: dict, name: str):
-    # Try queryResult.parameters
-    query = body.get("queryResult", {})
-    params = query.get("parameters", {}) or {}
-    if name in params and params[name]:
-        return params[name]
-
-    # Try outputContexts (often used to store across follow-ups)
-    contexts = query.get("outputContexts", []) or []
-    for ctx in contexts:
-        ctx_params = ctx.get("parameters", {}) or {}
-        if name in ctx_params and ctx_params[name]:
-            return ctx_params[name]
-
-    return None
+    return DialogflowRequest.from_body(body).param(name)
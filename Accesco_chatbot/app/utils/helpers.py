@@ -1,4 +1,6 @@
-import uuid
+from Accesco_chatbot.app.utils.ids import order_ids
+
+
 def generate_order_id(prefix: str = "EX"):
-    # short unique id
-    return f"{prefix}{uuid.uuid4().hex[:8].upper()}"
+    # time-ordered, see utils/ids.py
+    return order_ids.new(prefix)
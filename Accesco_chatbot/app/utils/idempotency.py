@@ -0,0 +1,118 @@
+# app/utils/idempotency.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+
+
+def idempotency_key(req: DialogflowRequest) -> Optional[str]:
+    """Dialogflow sends the same responseId when it retries a webhook call."""
+    if not req.response_id:
+        return None
+    return f"{req.session}:{req.response_id}"
+
+
+class ResponseCache:
+    """
+    Remembers fulfillment responses for `ttl` seconds so a retried delivery
+    is answered with the original response instead of running the handler
+    (and its writes) again. A retry that arrives while the first delivery
+    is still running waits for it rather than starting a second one.
+
+    Per process: with several workers a retry can land on a worker that has
+    not seen the first delivery.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, response) once done, or an in-flight Future
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.joins = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def run(self, key: Optional[str], compute: Callable[[], Awaitable[dict]]) -> dict:
+        if key is None or not self.enabled:
+            return await compute()
+
+        while True:
+            entry = self._entries.get(key)
+
+            if isinstance(entry, asyncio.Future):
+                self.joins += 1
+                try:
+                    return await asyncio.shield(entry)
+                except asyncio.CancelledError:
+                    if not entry.cancelled():
+                        raise
+                    # The first delivery was cancelled: take over
+                    continue
+
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > time.monotonic():
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+
+            break
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = future
+        try:
+            response = await compute()
+        except BaseException as e:
+            # Failures are not cached: the next retry runs the handler again
+            self._entries.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody was waiting
+            raise
+
+        future.set_result(response)
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        self._evict()
+        return response
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if isinstance(oldest, asyncio.Future):
+                break
+            if len(self._entries) <= self.max_entries and oldest[0] > now:
+                break
+            del self._entries[oldest_key]
+
+    def clear(self):
+        self._entries = OrderedDict(
+            (k, v) for k, v in self._entries.items() if isinstance(v, asyncio.Future)
+        )
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "joins": self.joins,
+            "misses": self.misses,
+        }
+
+
+webhook_responses = ResponseCache(
+    ttl=settings.IDEMPOTENCY_TTL,
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+)
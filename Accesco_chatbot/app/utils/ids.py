@@ -0,0 +1,126 @@
+# app/utils/ids.py
+import hashlib
+import os
+import re
+import socket
+import threading
+import time
+from typing import Optional
+
+from Accesco_chatbot.app.config import settings
+
+# Crockford base32: no I, L, O, U, so IDs read out over the phone survive
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# 2025-01-01T00:00:00Z; 41 bits of milliseconds last until 2094
+EPOCH_MS = 1735689600000
+
+TIME_BITS = 41
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# 64 bits fit in 13 base32 characters
+ID_CHARS = 13
+PREFIX = "EX"
+
+ORDER_ID_RE = re.compile(rf"^{PREFIX}[{ALPHABET}]{{{ID_CHARS}}}$")
+# Formats issued before this module: uuid4()[:10] and EX + 8 hex digits
+LEGACY_ORDER_ID_RES = (
+    re.compile(r"^[0-9A-F]{8}-[0-9A-F]$"),
+    re.compile(r"^EX[0-9A-F]{8}$"),
+)
+
+_READ_AS = str.maketrans({"I": "1", "L": "1", "O": "0"})
+
+
+def default_node() -> int:
+    """Derived from host and pid, so workers on one machine differ."""
+    digest = hashlib.blake2b(f"{socket.gethostname()}:{os.getpid()}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") & MAX_NODE
+
+
+def encode(value: int) -> str:
+    chars = []
+    for _ in range(ID_CHARS):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class OrderIdGenerator:
+    """
+    Snowflake-style order IDs: milliseconds since EPOCH_MS, a node number
+    and a per-millisecond sequence, packed into 64 bits and written as
+    13 Crockford base32 characters after the prefix.
+
+    IDs from one generator are strictly increasing, and fixed-width
+    encoding keeps string order equal to numeric order, so inserts land
+    at the right edge of the order_id index instead of all over it. Two
+    generators can only collide if they share a node number, which is
+    why each worker needs its own (ORDER_ID_NODE, else derived from host
+    and pid).
+    """
+
+    def __init__(self, node: int, prefix: str = PREFIX, clock=time.time):
+        if not 0 <= node <= MAX_NODE:
+            raise ValueError(f"node must be between 0 and {MAX_NODE}")
+        self.node = node
+        self.prefix = prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _next_int(self) -> int:
+        with self._lock:
+            now = int(self._clock() * 1000) - EPOCH_MS
+            if now > self._last_ms:
+                self._last_ms = now
+                self._sequence = 0
+            else:
+                # Same millisecond, or the clock stepped back: keep counting
+                # from the last timestamp rather than reuse one
+                self._sequence += 1
+                if self._sequence > MAX_SEQUENCE:
+                    self._last_ms += 1
+                    self._sequence = 0
+            return (
+                (self._last_ms << (NODE_BITS + SEQUENCE_BITS))
+                | (self.node << SEQUENCE_BITS)
+                | self._sequence
+            )
+
+    def new(self, prefix: Optional[str] = None) -> str:
+        return (self.prefix if prefix is None else prefix) + encode(self._next_int())
+
+
+def normalize_order_id(value) -> Optional[str]:
+    """
+    The canonical form of a user-supplied order ID, or None when it cannot
+    be one (so callers can answer without a query). Case is ignored and,
+    for new IDs, I/L and O are read as 1 and 0.
+    """
+    if value is None:
+        return None
+    text = str(value).strip().upper()
+
+    for pattern in LEGACY_ORDER_ID_RES:
+        if pattern.match(text):
+            return text
+
+    if text.startswith(PREFIX):
+        text = PREFIX + text[len(PREFIX):].translate(_READ_AS)
+        if ORDER_ID_RE.match(text):
+            return text
+    return None
+
+
+order_ids = OrderIdGenerator(
+    node=settings.ORDER_ID_NODE if settings.ORDER_ID_NODE is not None else default_node()
+)
+
+
+def new_order_id() -> str:
+    return order_ids.new()
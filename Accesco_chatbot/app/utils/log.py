@@ -0,0 +1,126 @@
+# app/utils/log.py
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from Accesco_chatbot.app.config import settings
+
+ROOT_LOGGER = "Accesco_chatbot"
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+# -------------------------------------------------------------
+# Formatting / filtering (formatting runs on the listener thread)
+# -------------------------------------------------------------
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                out[key] = value
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` fraction of DEBUG records; other levels always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1.0 or random.random() < self.rate
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve the message here; JSON encoding happens off the event loop
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# -------------------------------------------------------------
+# Setup / teardown
+# -------------------------------------------------------------
+_listener: Optional[QueueListener] = None
+
+
+def parse_intent_levels(spec: str) -> dict:
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(
+    level: str = settings.LOG_LEVEL,
+    fmt: str = settings.LOG_FORMAT,
+    sample_rate: float = settings.LOG_DEBUG_SAMPLE_RATE,
+    intent_levels: str = settings.LOG_INTENT_LEVELS,
+    stream=None,
+    force: bool = False,
+) -> QueueListener:
+    global _listener
+    if _listener is not None:
+        if not force:
+            return _listener
+        shutdown_logging()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if fmt == "json"
+        else logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.handlers[:] = [queue_handler]
+    root.propagate = False
+
+    prefix = f"{ROOT_LOGGER}.intent."
+    for name, existing in list(logging.Logger.manager.loggerDict.items()):
+        if name.startswith(prefix) and isinstance(existing, logging.Logger):
+            existing.setLevel(logging.NOTSET)
+    for name, intent_level in parse_intent_levels(intent_levels).items():
+        intent_logger(name).setLevel(intent_level)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Stops the listener thread after draining what is already queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def intent_logger(handler_name: str) -> logging.Logger:
+    """Per intent handler logger, so levels can be tuned one intent at a time."""
+    return logging.getLogger(f"{ROOT_LOGGER}.intent.{handler_name}")
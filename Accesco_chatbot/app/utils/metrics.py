@@ -0,0 +1,198 @@
+# app/utils/metrics.py
+import bisect
+import contextvars
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+# -------------------------------------------------------------
+# Prometheus text-format primitives
+# -------------------------------------------------------------
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def totals(self) -> Dict[Tuple[str, ...], Tuple[float, int]]:
+        """(sum, count) per label set."""
+        return {labels: (series[-2], int(series[-1])) for labels, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                le = _labels(self.labels, label_values, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {int(series[-1])}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {int(series[-1])}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {value:g}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        # name -> (type, help, callback read at scrape time)
+        self._callbacks: Dict[str, Tuple[str, str, Callable[[], float]]] = {}
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        h = Histogram(name, help_text, tuple(labels), buckets)
+        self._metrics.append(h)
+        return h
+
+    def counter(self, name, help_text, labels=()) -> Counter:
+        c = Counter(name, help_text, tuple(labels))
+        self._metrics.append(c)
+        return c
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], float], kind: str = "gauge"):
+        """Value read from `callback` at scrape time. Use kind="counter" for
+        monotonic totals kept elsewhere (catalog hits, swept rows)."""
+        self._callbacks[name] = (kind, help_text, callback)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, (kind, help_text, callback) in self._callbacks.items():
+            try:
+                value = float(callback())
+            except Exception:
+                continue
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value:g}"])
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_duration = registry.histogram(
+    "http_request_duration_seconds", "End-to-end HTTP request latency.", ("path", "status"))
+webhook_duration = registry.histogram(
+    "webhook_request_duration_seconds", "End-to-end /webhook latency per intent handler.", ("intent",))
+webhook_db_duration = registry.histogram(
+    "webhook_db_duration_seconds", "Time spent executing SQL per /webhook request.", ("intent",))
+webhook_db_queries = registry.histogram(
+    "webhook_db_queries", "SQL statements per /webhook request.", ("intent",), buckets=COUNT_BUCKETS)
+webhook_serialization = registry.histogram(
+    "webhook_serialization_duration_seconds", "Response serialization time per /webhook request.", ("intent",))
+webhook_requests = registry.counter(
+    "webhook_requests_total", "Handled /webhook requests.", ("intent",))
+
+
+# -------------------------------------------------------------
+# Request-scoped timings
+# -------------------------------------------------------------
+class RequestMetrics:
+    __slots__ = ("intent", "db_seconds", "queries", "serialization_seconds")
+
+    def __init__(self):
+        self.intent: Optional[str] = None
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.serialization_seconds = 0.0
+
+
+current_request: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+def current() -> Optional[RequestMetrics]:
+    return current_request.get()
+
+
+# The start time lives on the statement's execution context, which is
+# discarded with it: a statement that raises leaves nothing behind on the
+# (pooled) connection for the next one to pick up.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    record = current_request.get()
+    if start is not None and record is not None:
+        record.db_seconds += time.perf_counter() - start
+        record.queries += 1
+
+
+def instrument_engine(sync_engine):
+    """Accumulates SQL time and statement count into the current request.
+    Safe to call more than once for the same engine."""
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def track_request(request, call_next):
+    """HTTP middleware: times the request and publishes its histograms."""
+    record = RequestMetrics()
+    token = current_request.set(record)
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        current_request.reset(token)
+
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        http_duration.observe(elapsed, path, status)
+
+        if record.intent is not None:
+            webhook_duration.observe(elapsed, record.intent)
+            webhook_db_duration.observe(record.db_seconds, record.intent)
+            webhook_db_queries.observe(record.queries, record.intent)
+            webhook_serialization.observe(record.serialization_seconds, record.intent)
+            webhook_requests.inc(record.intent)
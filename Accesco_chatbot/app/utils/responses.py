@@ -0,0 +1,90 @@
+# app/utils/responses.py
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: plain JSONResponse is used without it
+    orjson = None
+
+
+# -------------------------------------------------------------
+# Cached fragments
+#
+# The image half of a card and the title only depend on the product,
+# so they are built once and shared between responses. Nothing mutates
+# a response after it is built, which is what makes sharing safe.
+# -------------------------------------------------------------
+@lru_cache(maxsize=4096)
+def image_fragment(raw_url: str, accessibility_text: str) -> Dict[str, str]:
+    return {"type": "image", "rawUrl": raw_url, "accessibilityText": accessibility_text}
+
+
+@lru_cache(maxsize=4096)
+def card_title(name: str) -> str:
+    return name.title()
+
+
+# -------------------------------------------------------------
+# df-messenger rich content
+# -------------------------------------------------------------
+class Card:
+    """An image + info pair, the unit of richContent the chat widget renders."""
+
+    __slots__ = ("image_url", "name", "subtitle")
+
+    def __init__(self, image_url: str, name: str, subtitle: str):
+        self.image_url = image_url
+        self.name = name
+        self.subtitle = subtitle
+
+    def render(self) -> List[Dict[str, str]]:
+        return [
+            image_fragment(self.image_url, self.name),
+            {"type": "info", "title": card_title(self.name), "subtitle": self.subtitle},
+        ]
+
+
+class Fulfillment:
+    """
+    Webhook reply: `text` is the fulfillmentText, `cards` go into a
+    richContent payload and `message` (defaults to `text`) follows them
+    as a chat bubble.
+    """
+
+    __slots__ = ("text", "cards", "message")
+
+    def __init__(self, text: str, cards: Sequence[Card] = (), message: Optional[str] = None):
+        self.text = text
+        self.cards = cards
+        self.message = message
+
+    def render(self) -> Dict[str, Any]:
+        return {
+            "fulfillmentText": self.text,
+            "fulfillmentMessages": [
+                {"payload": {"richContent": [card.render() for card in self.cards]}},
+                {"text": {"text": [self.text if self.message is None else self.message]}},
+            ],
+        }
+
+
+# -------------------------------------------------------------
+# Serialization
+# -------------------------------------------------------------
+def _orjson_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FulfillmentResponse(JSONResponse):
+    """orjson-encoded JSONResponse; falls back to the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_orjson_default)
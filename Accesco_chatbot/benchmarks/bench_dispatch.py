@@ -0,0 +1,104 @@
+"""
+Per-request intent dispatch cost: if-chain vs IntentDispatcher.
+
+Run from the repository root:
+    python -m Accesco_chatbot.benchmarks.bench_dispatch [--intents 120]
+"""
+import argparse
+import random
+import timeit
+
+from Accesco_chatbot.app.utils.dispatcher import IntentDispatcher
+
+
+def _handler(body, db):
+    return None
+
+
+def build_routes(n: int):
+    """Mix of exact, prefix (with a '- no' exclusion) and substring routes."""
+    routes = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            routes.append(("exact", f"venture {i} - info", None))
+        elif kind == 1:
+            routes.append(("prefix", f"order shop{i} - custom", "- no"))
+        else:
+            routes.append(("prefix", f"order shop{i} - custom - no", None))
+    routes.append(("contains", "track order", None))
+    return routes
+
+
+def build_if_chain(routes):
+    """Equivalent of today's webhook(): test every route in order."""
+    checks = []
+    for kind, pattern, unless in routes:
+        if kind == "exact":
+            checks.append(lambda s, p=pattern: s == p)
+        elif kind == "prefix" and unless:
+            checks.append(lambda s, p=pattern, u=unless: s.startswith(p) and u not in s)
+        elif kind == "prefix":
+            checks.append(lambda s, p=pattern: s.startswith(p))
+        else:
+            checks.append(lambda s, p=pattern: p in s)
+
+    def dispatch(intent):
+        intent_lower = intent.lower()
+        for check in checks:
+            if check(intent_lower):
+                return _handler
+        return None
+
+    return dispatch
+
+
+def build_dispatcher(routes):
+    d = IntentDispatcher()
+    for kind, pattern, unless in routes:
+        if kind == "exact":
+            d.exact(pattern)(_handler)
+        elif kind == "prefix":
+            d.prefix(pattern, unless=unless)(_handler)
+        else:
+            d.contains(pattern)(_handler)
+    return d.compile()
+
+
+def sample_intents(routes, k: int, seed: int = 7):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(k):
+        kind, pattern, _ = rnd.choice(routes)
+        if kind == "contains":
+            out.append("Track Order - status")
+        elif kind == "prefix":
+            out.append(pattern.title() + " - more")
+        else:
+            out.append(pattern.upper())
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intents", type=int, default=120)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    routes = build_routes(args.intents)
+    chain = build_if_chain(routes)
+    dispatcher = build_dispatcher(routes)
+    workload = sample_intents(routes, args.requests)
+
+    # Both implementations must agree before timing them
+    for intent in workload[:2000]:
+        assert (chain(intent) is None) == (dispatcher.resolve(intent) is None), intent
+
+    for name, fn in (("if-chain", chain), ("dispatcher", dispatcher.resolve)):
+        best = min(timeit.repeat(lambda: [fn(i) for i in workload], number=1, repeat=5))
+        print(f"{name:<12} {best / len(workload) * 1e9:10.1f} ns/request "
+              f"({len(routes)} routes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+/webhook throughput with intent debug logging disabled, enabled, enabled
+with sampling, and the old print() statements for comparison.
+
+Uses an intent with no handler, so no database is needed. Log output goes
+to a sink that blocks for --sink-latency-us per write, standing in for a
+stdout pipe that the log collector is slow to drain. Run from the
+repository root:
+    python -m Accesco_chatbot.benchmarks.bench_logging --requests 5000
+"""
+import argparse
+import asyncio
+import contextlib
+import sys
+import time
+
+import httpx
+
+from Accesco_chatbot.app.main import app
+from Accesco_chatbot.app.utils.log import setup_logging, shutdown_logging
+
+BODY = {
+    "responseId": "bench",
+    "session": "projects/bench/agent/sessions/bench-session",
+    "queryResult": {
+        "intent": {"displayName": "bench unknown intent"},
+        "parameters": {
+            "eatfeast-food-items": ["paneer tikka", "dal makhani", "jeera rice", "butter naan"],
+            "number": [2, 1, 1, 4],
+            "ingredients": [],
+            "order_id": "",
+        },
+        "outputContexts": [
+            {"name": f"projects/bench/agent/sessions/bench-session/contexts/ctx-{i}",
+             "lifespanCount": 5, "parameters": {"order_id": f"ORD{i}"}}
+            for i in range(3)
+        ],
+    },
+}
+
+
+class SlowSink:
+    def __init__(self, latency_us: int):
+        self.latency = latency_us / 1_000_000
+
+    def write(self, data: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def legacy_prints():
+    # What webhook.py did on every request before structured logging
+    query = BODY["queryResult"]
+    print("\n---------------------------")
+    print("Intent Triggered:", query["intent"]["displayName"])
+    print("Parameters:", query["parameters"])
+    print("---------------------------\n")
+
+
+async def run(n: int, concurrency: int, hook=None) -> float:
+    transport = httpx.ASGITransport(app=app)
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with sem:
+                if hook:
+                    hook()
+                r = await client.post("/webhook", json=BODY)
+                r.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n)))
+        return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--sink-latency-us", type=int, default=50)
+    args = parser.parse_args()
+
+    sink = SlowSink(args.sink_latency_us)
+    modes = [
+        ("debug disabled (INFO)", dict(level="INFO"), None),
+        ("debug enabled", dict(level="DEBUG"), None),
+        ("debug sampled 1%", dict(level="DEBUG", sample_rate=0.01), None),
+        ("debug for one other intent", dict(level="INFO", intent_levels="track_order=DEBUG"), None),
+        ("legacy print()", dict(level="INFO"), legacy_prints),
+    ]
+
+    # warm-up
+    setup_logging(level="INFO", stream=sink, force=True)
+    asyncio.run(run(200, args.concurrency))
+
+    for label, options, hook in modes:
+        setup_logging(stream=sink, force=True, **{"sample_rate": 1.0, "intent_levels": "", **options})
+        with contextlib.redirect_stdout(sink) if hook else contextlib.nullcontext():
+            rps = max(asyncio.run(run(args.requests, args.concurrency, hook)) for _ in range(args.rounds))
+        print(f"{label:<28} {rps:8.0f} req/s (best of {args.rounds})", file=sys.stderr)
+
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Parameter lookups on webhook bodies with many output contexts: the old
+per-lookup walk over queryResult.outputContexts vs DialogflowRequest,
+parsed once per call with a flattened context index.
+
+No database needed. Run from the repository root:
+    python -m Accesco_chatbot.benchmarks.bench_param_index --contexts 20 50 100
+"""
+import argparse
+import time
+
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+from Accesco_chatbot.benchmarks import payloads
+
+# "order_id" sits in the last context and "customer" is in none, the two
+# cases where the old walk is longest; "feedback" is a turn parameter.
+NAMES = ["order_id", "feedback", "customer"]
+
+
+def body_with_contexts(n: int) -> dict:
+    sid = "bench-session"
+    contexts = [
+        payloads.context(sid, f"filler-{i}", {"step": i, "order_id": "", f"slot-{i}": f"value-{i}"})
+        for i in range(n - 1)
+    ]
+    contexts.append(payloads.context(sid, "cancelorder-followup", {"order_id": "EX1234ABCD"}))
+    return payloads.webhook_body(sid, "cancel order - yes", "yes", {"feedback": "too slow"}, contexts)
+
+
+def walk(body: dict, name: str):
+    """The lookup every service used to do for itself."""
+    query = body.get("queryResult", {})
+    params = query.get("parameters", {}) or {}
+    if name in params and params[name]:
+        return params[name]
+
+    contexts = query.get("outputContexts", []) or []
+    for ctx in contexts:
+        ctx_params = ctx.get("parameters", {}) or {}
+        if name in ctx_params and ctx_params[name]:
+            return ctx_params[name]
+
+    return None
+
+
+def per_lookup_walk(body: dict, names: list):
+    return [walk(body, name) for name in names]
+
+
+def parsed_once(body: dict, names: list):
+    req = DialogflowRequest.from_body(body)
+    return [req.param(name) for name in names]
+
+
+def time_per_call(fn, body: dict, names: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(body, names)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contexts", type=int, nargs="+", default=[1, 20, 50, 100])
+    parser.add_argument("--lookups", type=int, nargs="+", default=[1, 3, 6, 12])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("µs per webhook call")
+    print(f"{'contexts':>8}  {'lookups':>7}  {'walk':>8}  {'indexed':>8}  {'speedup':>7}")
+    for n in args.contexts:
+        body = body_with_contexts(n)
+        for k in args.lookups:
+            names = [NAMES[i % len(NAMES)] for i in range(k)]
+            if per_lookup_walk(body, names) != parsed_once(body, names):
+                raise SystemExit(f"lookups disagree at {n} contexts")
+            old = time_per_call(per_lookup_walk, body, names, args.repeat)
+            new = time_per_call(parsed_once, body, names, args.repeat)
+            print(f"{n:>8}  {k:>7}  {old:>8.2f}  {new:>8.2f}  {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
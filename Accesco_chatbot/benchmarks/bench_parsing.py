@@ -0,0 +1,102 @@
+"""
+Webhook body parsing: the stdlib parser (what request.json() used) vs
+DialogflowRequest.from_bytes with each fast parser that is installed, on
+a small turn and on a ~50 KB body (long context history and a large
+originalDetectIntentRequest payload, as the chat widget can send).
+
+No database needed. Run from the repository root:
+    python -m Accesco_chatbot.benchmarks.bench_parsing
+"""
+import argparse
+import json
+import time
+
+from Accesco_chatbot.app.utils import extract
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+from Accesco_chatbot.benchmarks import payloads
+
+MALFORMED = [b"", b"{", b"not json", b"[1, 2]", b'"text"', b"\xff\xfe"]
+
+
+def small_body() -> bytes:
+    return json.dumps(payloads.track("bench-session", "EX1234ABCD")).encode()
+
+
+def large_body(target: int = 50_000) -> bytes:
+    sid = "bench-session"
+    contexts = [
+        payloads.context(sid, f"history-{i}", {
+            "order_id": "", "step": i,
+            "eatfeast-food-items": [f"dish {i} {j}" for j in range(5)],
+            "number": list(range(5)),
+        })
+        for i in range(40)
+    ]
+    body = payloads.webhook_body(sid, "cancel order - yes", "yes", {}, contexts)
+    body["queryResult"]["outputContexts"].append(
+        payloads.context(sid, "cancelorder-followup", {"order_id": "EX1234ABCD"})
+    )
+    history = body["originalDetectIntentRequest"]["payload"]
+    history["messages"] = []
+    while len(json.dumps(body)) < target:
+        history["messages"].append({"author": "user", "text": "where is my order " * 4, "ts": time.time()})
+    return json.dumps(body).encode()
+
+
+def stdlib(raw: bytes) -> DialogflowRequest:
+    return DialogflowRequest.from_body(json.loads(raw))
+
+
+def per_call(fn, raw: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(raw)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def parsers() -> list:
+    available = ["json"]
+    if extract.orjson is not None:
+        available.append("orjson")
+    if extract.msgspec is not None:
+        available.append("msgspec")
+    return available
+
+
+def check_malformed(parser: str):
+    for raw in MALFORMED:
+        try:
+            DialogflowRequest.from_bytes(raw)
+        except ValueError:
+            continue
+        raise SystemExit(f"{parser}: {raw!r} was accepted")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    bodies = {"small": small_body(), "50 KB": large_body()}
+    configured = extract.PARSER
+    try:
+        for name, raw in bodies.items():
+            expected = stdlib(raw)
+            baseline = per_call(stdlib, raw, args.repeat)
+            print(f"{name} ({len(raw)} bytes): request.json() + from_body {baseline:.1f} µs")
+            for p in parsers():
+                extract.PARSER = p
+                check_malformed(p)
+                req = DialogflowRequest.from_bytes(raw)
+                if (req.intent, req.session, req.param("order_id")) != (
+                        expected.intent, expected.session, expected.param("order_id")):
+                    raise SystemExit(f"{p}: parsed request differs")
+                took = per_call(DialogflowRequest.from_bytes, raw, args.repeat)
+                print(f"    from_bytes [{p:>7}] {took:8.1f} µs  {baseline / took:5.1f}x")
+    finally:
+        extract.PARSER = configured
+    print("OK: malformed bodies rejected by every parser")
+
+
+if __name__ == "__main__":
+    main()
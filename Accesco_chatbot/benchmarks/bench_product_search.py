@@ -0,0 +1,72 @@
+"""
+In-memory fuzzy product search over a synthetic catalog.
+
+Run from the repository root:
+    python -m Accesco_chatbot.benchmarks.bench_product_search --products 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from Accesco_chatbot.app.services.catalog_service import ProductEntry
+from Accesco_chatbot.app.services.product_search import FuzzyProductIndex
+
+BRANDS = ["amul", "tata", "haldiram", "mdh", "everest", "britannia", "nestle", "aashirvaad",
+          "fortune", "patanjali", "mother dairy", "parle", "dabur", "saffola", "india gate"]
+WORDS = ["paneer", "tikka", "masala", "dal", "makhani", "butter", "chicken", "biryani", "veg",
+         "dosa", "idli", "sambar", "aloo", "paratha", "basmati", "rice", "atta", "ghee", "tea",
+         "coffee", "biscuit", "namkeen", "bhujia", "chole", "rajma", "poha", "upma", "kulfi",
+         "lassi", "curd", "milk", "mango", "pickle", "papad", "jeera", "haldi", "mirchi", "oil",
+         "sugar", "salt", "honey", "jam", "noodles", "soup", "cookies", "rusk", "khichdi", "halwa"]
+SIZES = ["100g", "200g", "500g", "1kg", "5kg", "250ml", "1l", "family pack", "combo"]
+
+
+def product_names(n: int, rnd: random.Random) -> list:
+    names = set()
+    while len(names) < n:
+        parts = [rnd.choice(BRANDS)] + rnd.sample(WORDS, rnd.randint(1, 3)) + [rnd.choice(SIZES)]
+        names.add(" ".join(parts))
+    return sorted(names)
+
+
+def misspell(name: str, rnd: random.Random) -> str:
+    words = name.split()[1:-1] or name.split()
+    word = rnd.choice(words)
+    if len(word) > 3:
+        i = rnd.randrange(1, len(word) - 1)
+        word = word[:i] + word[i + 1:]
+    return word if rnd.random() < 0.5 else f"{word} {rnd.choice(words)}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    names = product_names(args.products, rnd)
+    entries = [ProductEntry(n, 10.0, True, None) for n in names]
+
+    start = time.perf_counter()
+    index = FuzzyProductIndex(entries)
+    print(f"built index over {len(entries)} products in {time.perf_counter() - start:.2f}s")
+
+    queries = [misspell(rnd.choice(names), rnd) for _ in range(args.queries)]
+    latencies = []
+    for q in queries:
+        t = time.perf_counter()
+        index.search(q, k=args.k)
+        latencies.append((time.perf_counter() - t) * 1000)
+
+    latencies.sort()
+    print(f"top-{args.k} search: p50 {statistics.median(latencies):.3f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f} ms")
+    q = queries[0]
+    print(f"example: {q!r} -> {[(s, e.name) for s, e in index.search(q, k=3)]}")
+
+
+if __name__ == "__main__":
+    main()
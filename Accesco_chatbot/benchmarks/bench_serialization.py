@@ -0,0 +1,87 @@
+"""
+Cost of building and serializing the confirm-order reply for large carts:
+hand-built dicts through FastAPI's encoder (the old path) vs Card /
+Fulfillment objects with cached fragments and orjson.
+
+No database needed. Run from the repository root:
+    python -m Accesco_chatbot.benchmarks.bench_serialization --lines 10 50 200
+"""
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from Accesco_chatbot.app.services.catalog_service import ProductEntry
+from Accesco_chatbot.app.utils.responses import Card, Fulfillment, FulfillmentResponse, orjson
+
+TEXT = "🎉 Your Swadisht order has been confirmed!\n💰 Total Amount: ₹12345.00\n📦 Order ID: EX12345678"
+
+
+def cart(n: int) -> tuple:
+    products = {
+        f"item {i}": ProductEntry(f"item {i}", 10.0 + i, True, f"https://cdn.example.com/products/{i}.png")
+        for i in range(n)
+    }
+    lines = [
+        {"item": f"item {i}", "quantity": 1 + i % 4, "customization": None,
+         "unit_price": 10.0 + i, "total_price": (10.0 + i) * (1 + i % 4)}
+        for i in range(n)
+    ]
+    return products, lines
+
+
+def legacy(products: dict, lines: list) -> bytes:
+    rich_cards = []
+    for item in lines:
+        product = products.get(item["item"])
+        rich_cards.append([
+            {"type": "image", "rawUrl": product.image_url, "accessibilityText": item["item"]},
+            {"type": "info", "title": item["item"].title(),
+             "subtitle": f"Qty: {item['quantity']} | ₹{item['total_price']}"},
+        ])
+    payload = {
+        "fulfillmentText": TEXT,
+        "fulfillmentMessages": [
+            {"payload": {"richContent": rich_cards}},
+            {"text": {"text": [TEXT]}},
+        ],
+    }
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+
+def current(products: dict, lines: list) -> bytes:
+    cards = [
+        Card(products[item["item"]].image_url, item["item"],
+             f"Qty: {item['quantity']} | ₹{item['total_price']}")
+        for item in lines
+    ]
+    return FulfillmentResponse(content=Fulfillment(TEXT, cards).render()).body
+
+
+def timed(fn, products, lines, rounds: int) -> float:
+    fn(products, lines)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(products, lines)
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if orjson else 'no (stdlib fallback)'}")
+    for n in args.lines:
+        products, lines = cart(n)
+        assert orjson is None or orjson.loads(legacy(products, lines)) == orjson.loads(current(products, lines))
+        old = timed(legacy, products, lines, args.rounds)
+        new = timed(current, products, lines, args.rounds)
+        print(f"{n:>4} lines: dicts + jsonable_encoder {old:8.1f} us, "
+              f"cards + orjson {new:8.1f} us ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
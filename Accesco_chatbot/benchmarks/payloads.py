@@ -0,0 +1,178 @@
+"""
+Dialogflow ES webhook payloads and scripted conversations for the
+benchmarks. Bodies carry the fields the webhook reads (intent,
+parameters, outputContexts) plus the surrounding envelope a real agent
+sends, so parsing cost is representative.
+"""
+import random
+import re
+import uuid
+from typing import Iterator, List, Optional
+
+PROJECT = "accesco-bench"
+
+SWADISHT = ("Swadisht", "order swadisht - custom", "eatfeast-food-items")
+GROKLY = ("Grokly", "order grokly - custom", "GroMArt-grocery")
+
+ORDER_ID_RE = re.compile(r"Order ID: (\S+)")
+
+
+def session_path(session_id: str) -> str:
+    return f"projects/{PROJECT}/agent/sessions/{session_id}"
+
+
+def context(session_id: str, name: str, parameters: dict, lifespan: int = 5) -> dict:
+    return {
+        "name": f"{session_path(session_id)}/contexts/{name}",
+        "lifespanCount": lifespan,
+        "parameters": parameters,
+    }
+
+
+def webhook_body(session_id: str, intent: str, query_text: str,
+                 parameters: Optional[dict] = None, contexts: Optional[List[dict]] = None) -> dict:
+    parameters = parameters or {}
+    return {
+        "responseId": f"{uuid.uuid4()}-{uuid.uuid4().hex[:8]}",
+        "session": session_path(session_id),
+        "queryResult": {
+            "queryText": query_text,
+            "parameters": parameters,
+            "allRequiredParamsPresent": True,
+            "fulfillmentText": "",
+            "fulfillmentMessages": [{"text": {"text": [""]}}],
+            "outputContexts": (contexts or []) + [
+                context(session_id, "__system_counters__", {
+                    "no-input": 0, "no-match": 0,
+                    **{f"{k}.original": str(v) for k, v in parameters.items()},
+                }, lifespan=1),
+            ],
+            "intent": {
+                "name": f"projects/{PROJECT}/agent/intents/{uuid.uuid5(uuid.NAMESPACE_DNS, intent)}",
+                "displayName": intent,
+            },
+            "intentDetectionConfidence": 1,
+            "languageCode": "en",
+        },
+        "originalDetectIntentRequest": {"source": "DIALOGFLOW_CONSOLE", "payload": {}},
+    }
+
+
+# -------------------------------------------------------------
+# Single turns
+# -------------------------------------------------------------
+def add_item(session_id: str, platform: tuple, items: List[str], quantities: List[int]) -> dict:
+    _, intent, item_param = platform
+    return webhook_body(
+        session_id, intent, f"add {', '.join(f'{q} {i}' for i, q in zip(items, quantities))}",
+        {item_param: items, "number": quantities},
+        [context(session_id, f"{intent.replace(' ', '')}-followup", {item_param: items, "number": quantities})],
+    )
+
+
+def confirm(session_id: str, platform: tuple) -> dict:
+    _, intent, _ = platform
+    return webhook_body(session_id, f"{intent} - no", "no, that's all")
+
+
+def custom_food(session_id: str, ingredients: List[str]) -> dict:
+    return webhook_body(
+        session_id, "create-custom-food", f"make a dish with {' and '.join(ingredients)}",
+        {"ingredients": ingredients},
+    )
+
+
+def custom_food_confirm(session_id: str) -> dict:
+    return webhook_body(session_id, "create-custom-food - confirm", "yes, place the order")
+
+
+def track(session_id: str, order_id: str) -> dict:
+    return webhook_body(session_id, "track order", f"where is my order {order_id}", {"order_id": order_id})
+
+
+def cancel(session_id: str, order_id: str) -> dict:
+    return webhook_body(
+        session_id, "cancel order", f"cancel order {order_id}", {"order_id": order_id},
+        [context(session_id, "cancelorder-followup", {"order_id": order_id})],
+    )
+
+
+def cancel_yes(session_id: str, order_id: str) -> dict:
+    return webhook_body(
+        session_id, "cancel order - yes", "yes",
+        contexts=[context(session_id, "cancelorder-followup", {"order_id": order_id})],
+    )
+
+
+def cancel_feedback(session_id: str, order_id: str, feedback: str) -> dict:
+    return webhook_body(
+        session_id, "cancel order - yes - confirm", feedback, {"feedback": feedback},
+        [context(session_id, "cancelorder-yes-followup", {"order_id": order_id})],
+    )
+
+
+# -------------------------------------------------------------
+# Conversations
+# -------------------------------------------------------------
+# A conversation is a generator of request bodies. After each body is
+# sent, the runner passes the JSON response back in with send(), which is
+# how later turns pick up the order id the confirm turn returned.
+FEEDBACK = ["ordered by mistake", "delivery too slow", "found it cheaper", "changed my mind"]
+
+
+def order_id_from(response: Optional[dict]) -> Optional[str]:
+    match = ORDER_ID_RE.search((response or {}).get("fulfillmentText", ""))
+    return match.group(1) if match else None
+
+
+def order_and_track(rnd: random.Random, products: List[str], ingredients: List[str]) -> Iterator[dict]:
+    sid = uuid.uuid4().hex
+    platform = rnd.choice([SWADISHT, GROKLY])
+    for _ in range(rnd.randint(1, 3)):
+        items = rnd.sample(products, rnd.randint(1, 3))
+        yield add_item(sid, platform, items, [rnd.randint(1, 4) for _ in items])
+    order_id = order_id_from((yield confirm(sid, platform)))
+    if order_id:
+        yield track(sid, order_id)
+
+
+def custom_dish(rnd: random.Random, products: List[str], ingredients: List[str]) -> Iterator[dict]:
+    sid = uuid.uuid4().hex
+    for _ in range(rnd.randint(1, 2)):
+        yield custom_food(sid, rnd.sample(ingredients, rnd.randint(2, 4)))
+    order_id = order_id_from((yield custom_food_confirm(sid)))
+    if order_id:
+        yield track(sid, order_id)
+
+
+def order_and_cancel(rnd: random.Random, products: List[str], ingredients: List[str]) -> Iterator[dict]:
+    sid = uuid.uuid4().hex
+    platform = rnd.choice([SWADISHT, GROKLY])
+    items = rnd.sample(products, rnd.randint(1, 3))
+    yield add_item(sid, platform, items, [rnd.randint(1, 4) for _ in items])
+    order_id = order_id_from((yield confirm(sid, platform)))
+    if not order_id:
+        return
+    yield cancel(sid, order_id)
+    yield cancel_yes(sid, order_id)
+    yield cancel_feedback(sid, order_id, rnd.choice(FEEDBACK))
+    yield track(sid, order_id)
+
+
+def track_unknown(rnd: random.Random, products: List[str], ingredients: List[str]) -> Iterator[dict]:
+    # Well-formed, so it still costs the lookup a real typo would
+    yield track(uuid.uuid4().hex, f"EX{rnd.randrange(16 ** 8):08X}")
+
+
+# (conversation, weight)
+SCENARIOS = [
+    (order_and_track, 5),
+    (custom_dish, 2),
+    (order_and_cancel, 2),
+    (track_unknown, 1),
+]
+
+
+def pick_scenario(rnd: random.Random):
+    conversations, weights = zip(*SCENARIOS)
+    return rnd.choices(conversations, weights=weights)[0]
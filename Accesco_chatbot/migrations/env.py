@@ -0,0 +1,52 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.database import Base
+import Accesco_chatbot.app.models  # noqa: F401
+from Accesco_chatbot.app.models.ingredients import Ingredient  # noqa: F401
+from Accesco_chatbot.app.models.temp_cart import TempCart  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _url() -> str:
+    # Lets scripts point alembic at another database (-x url=...)
+    return context.get_x_argument(as_dictionary=True).get("url") or settings.DATABASE_URL
+
+
+def run_migrations_offline():
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # Migrations need a session-level connection: point DB_HOST/DB_PORT at
+    # the direct Postgres port, not the transaction pooler.
+    connectable = create_engine(
+        _url(),
+        poolclass=pool.NullPool,
+        connect_args={"sslmode": settings.DB_SSLMODE},
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
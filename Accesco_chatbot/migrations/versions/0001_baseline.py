@@ -0,0 +1,72 @@
+"""Baseline schema (tables as they exist on Supabase)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # IF NOT EXISTS: the production tables predate the migrations
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS products (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR NOT NULL,
+            price DOUBLE PRECISION NOT NULL,
+            available BOOLEAN,
+            image_url TEXT
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ingredients (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR NOT NULL UNIQUE,
+            price NUMERIC(10, 2) NOT NULL,
+            image_url TEXT
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS orders (
+            id SERIAL PRIMARY KEY,
+            order_id VARCHAR NOT NULL,
+            platform VARCHAR NOT NULL,
+            session_id VARCHAR,
+            items JSON,
+            status VARCHAR,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            price NUMERIC(10, 2) NOT NULL
+        )
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_orders_order_id ON orders (order_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_orders_session_id ON orders (session_id)")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS temp_cart (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            session_id VARCHAR NOT NULL UNIQUE,
+            user_id VARCHAR,
+            cart_items JSONB NOT NULL,
+            total_price NUMERIC(10, 2),
+            status VARCHAR,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS cancel_feedback (
+            id SERIAL PRIMARY KEY,
+            order_id VARCHAR(50) NOT NULL,
+            feedback TEXT NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+
+
+def downgrade():
+    for table in ("cancel_feedback", "temp_cart", "orders", "ingredients", "products"):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
@@ -0,0 +1,60 @@
+"""Indexes for the webhook hot paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+- products (name, available): catalog lookups by name when the cache is off
+- products name trigram (GIN): ILIKE '%x%' product search, when pg_trgm
+  is available on the server
+- temp_cart (updated_at): the abandoned-cart sweeper
+- cancel_feedback (order_id): had no index at all
+
+temp_cart.session_id, orders.order_id and ingredients.name are already
+unique, so their lookups are covered by the unique indexes.
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_products_name_available": "ON products (name, available)",
+    "ix_temp_cart_updated_at": "ON temp_cart (updated_at)",
+    "ix_cancel_feedback_order_id": "ON cancel_feedback (order_id)",
+}
+
+
+def upgrade():
+    # CONCURRENTLY can't run inside a transaction, but keeps the live
+    # tables writable while the indexes build.
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+
+        op.execute("""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                END IF;
+            END
+            $$
+        """)
+        has_trgm = op.get_bind().exec_driver_sql(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+        ).scalar()
+        if has_trgm:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_name_trgm "
+                "ON products USING gin (name gin_trgm_ops)"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_products_name_trgm")
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
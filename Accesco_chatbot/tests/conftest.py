@@ -0,0 +1,103 @@
+"""
+Tests marked `postgres` need a server: set TEST_DATABASE_URL to a plain
+postgresql:// URL whose user may CREATE DATABASE. Each run migrates a
+fresh database next to it and drops it afterwards; without the variable
+those tests are skipped.
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost/postgres DB_SSLMODE=disable pytest
+"""
+import asyncio
+import os
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, make_url, text
+
+from Accesco_chatbot.app import database
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.services.catalog_service import catalog
+from Accesco_chatbot.app.services.ingredient_pricing import ingredient_index
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs TEST_DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+def _sync(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+psycopg2://")
+
+
+@contextmanager
+def fresh_database():
+    """A new, migrated database on the TEST_DATABASE_URL server."""
+    server = make_url(TEST_DATABASE_URL)
+    url = server.set(database=f"accesco_test_{uuid.uuid4().hex[:12]}").render_as_string(hide_password=False)
+    admin = create_engine(_sync(TEST_DATABASE_URL), isolation_level="AUTOCOMMIT",
+                          connect_args={"sslmode": settings.DB_SSLMODE})
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE DATABASE "{make_url(url).database}"'))
+    try:
+        cfg = Config(ALEMBIC_INI)
+        cfg.cmd_opts = SimpleNamespace(x=[f"url={_sync(url)}"])
+        command.upgrade(cfg, "head")
+        yield url
+    finally:
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{make_url(url).database}" WITH (FORCE)'))
+        admin.dispose()
+
+
+@pytest.fixture(scope="session")
+def pg_url():
+    with fresh_database() as url:
+        yield url
+
+
+@pytest.fixture(scope="module")
+def scratch_url():
+    """A migrated database of its own, for tests that load lots of data."""
+    with fresh_database() as url:
+        yield url
+
+
+@pytest.fixture
+def pg_engine(pg_url):
+    """Sync engine on the test database, for seeding and checks."""
+    engine = database.create_db_engine(_sync(pg_url), pool_mode="null")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def app_db(pg_url, monkeypatch):
+    """
+    Points the app's async sessions at the test database, with empty
+    caches. Each test runs its own event loop, so nothing loop-bound may
+    carry over: no connection pool, and fresh refresh locks for the caches.
+    """
+    previous = database.async_engine
+    engine = database.use_async_database(pg_url, pool_mode="null")
+    for cache in (catalog, ingredient_index):
+        cache.invalidate()
+        monkeypatch.setattr(cache, "_lock", asyncio.Lock())
+    yield engine
+    catalog.invalidate()
+    ingredient_index.invalidate()
+    database.async_engine = previous
+    database.AsyncSessionLocal.configure(bind=previous)
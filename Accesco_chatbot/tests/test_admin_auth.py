@@ -0,0 +1,38 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from Accesco_chatbot.app.config import settings
+from Accesco_chatbot.app.routers.admin import router
+
+ORDERS = [{"platform": "Swadisht", "items": [{"item": "paneer tikka", "quantity": 1}]}]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("configured", ["", "dev-secret"])
+@pytest.mark.parametrize("sent", [None, "", "dev-secret"])
+def test_import_disabled_without_admin_key(client, monkeypatch, configured, sent):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", configured)
+    headers = {} if sent is None else {"X-Admin-Key": sent}
+    r = client.post("/admin/orders/import", json=ORDERS, headers=headers)
+    assert r.status_code == 503
+
+
+@pytest.mark.parametrize("sent", [None, "", "dev-secret", "s3cret-but-not-quite"])
+def test_import_rejects_wrong_key(client, monkeypatch, sent):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "s3cret")
+    headers = {} if sent is None else {"X-Admin-Key": sent}
+    r = client.post("/admin/orders/import", json=ORDERS, headers=headers)
+    assert r.status_code == 403
+
+
+def test_admin_key_accepted(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "s3cret")
+    r = client.get("/admin/catalog", headers={"X-Admin-Key": "s3cret"})
+    assert r.status_code == 200
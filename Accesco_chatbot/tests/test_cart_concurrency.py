@@ -0,0 +1,52 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from Accesco_chatbot.app import database
+from Accesco_chatbot.app.main import app
+from Accesco_chatbot.app.models.ingredients import Ingredient
+from Accesco_chatbot.app.models.products import Products
+from Accesco_chatbot.app.services.cart_store import cart_store
+from Accesco_chatbot.benchmarks import payloads
+
+pytestmark = pytest.mark.postgres
+
+PARALLEL = 20
+
+
+@pytest.fixture
+def seeded(pg_engine):
+    with database.SessionLocal(bind=pg_engine) as db:
+        existing = {name for (name,) in db.query(Products.name).filter(Products.name.like("cc item %"))}
+        db.add_all(
+            Products(name=f"cc item {i}", price=5.0, available=True, image_url=None)
+            for i in range(PARALLEL) if f"cc item {i}" not in existing
+        )
+        if not db.query(Ingredient).filter(Ingredient.name == "cc salt").first():
+            db.add(Ingredient(name="cc salt", price=1))
+        db.commit()
+
+
+async def parallel_turns(n: int) -> set:
+    """n add-item turns plus a custom dish, all at once on one session; returns the cart's items."""
+    session = uuid.uuid4().hex
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://cc") as client:
+        turns = [payloads.add_item(session, payloads.SWADISHT, [f"cc item {i}"], [1]) for i in range(n)]
+        turns.insert(n // 2, payloads.custom_food(session, ["cc salt"]))
+        for r in await asyncio.gather(*(client.post("/webhook", json=t) for t in turns)):
+            r.raise_for_status()
+
+    async with database.AsyncSessionLocal() as db:
+        cart_items, _ = await cart_store.pop(db, session)
+        await db.commit()
+    return {line["item"] for line in cart_items}
+
+
+@pytest.mark.parametrize("round_", range(3))
+def test_parallel_turns_lose_no_line(app_db, seeded, round_):
+    items = asyncio.run(parallel_turns(PARALLEL))
+    expected = {f"cc item {i}" for i in range(PARALLEL)} | {"custom dish"}
+    assert expected - items == set()
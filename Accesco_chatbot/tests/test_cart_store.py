@@ -0,0 +1,109 @@
+import asyncio
+from contextlib import nullcontext
+
+import fakeredis
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from Accesco_chatbot.app.services import order_service
+from Accesco_chatbot.app.services.cart_store import CartStore, MemoryCartStore, RedisCartStore
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+from Accesco_chatbot.benchmarks.payloads import webhook_body
+
+
+def line(item: str, quantity: int = 1, price: float = 100.0) -> dict:
+    return order_service.cart_line(item, quantity, None, price)
+
+
+def make_store(kind: str) -> CartStore:
+    if kind == "memory":
+        return MemoryCartStore(ttl=60)
+    return RedisCartStore(ttl=60, client=fakeredis.FakeAsyncRedis())
+
+
+class FailingCommitSession:
+    """Stands in for AsyncSession when the order INSERT can't commit."""
+
+    def __init__(self):
+        self.added = []
+        self.rolled_back = False
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def begin_nested(self):
+        return nullcontext()
+
+    async def commit(self):
+        raise OperationalError("COMMIT", {}, Exception("connection reset"))
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_store_missing_a_method_fails_on_creation():
+    class Incomplete(CartStore):
+        async def merge_lines(self, db, session_id, lines): ...
+        async def update(self, db, session_id, mutate): ...
+        async def pop(self, db, session_id): ...
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+def test_cart_survives_failed_confirm(monkeypatch, kind):
+    store = make_store(kind)
+    monkeypatch.setattr(order_service, "cart_store", store)
+    req = DialogflowRequest.from_body(webhook_body("s1", "order.confirm", "confirm"))
+    db = FailingCommitSession()
+
+    async def run():
+        await store.merge_lines(None, "s1", [line("paneer tikka", 2)])
+        with pytest.raises(OperationalError):
+            await order_service.handle_confirm_order(req, db, "Swadisht")
+        return await store.pop(None, "s1")
+
+    cart_items, total = asyncio.run(run())
+    assert db.rolled_back
+    assert [i["item"] for i in cart_items] == ["paneer tikka"]
+    assert total == 200
+
+
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+def test_restore_keeps_lines_added_after_pop(kind):
+    store = make_store(kind)
+
+    async def run():
+        await store.merge_lines(None, "s1", [line("dal", 1), line("naan", 2)])
+        popped, _ = await store.pop(None, "s1")
+        await store.merge_lines(None, "s1", [line("naan", 5), line("lassi", 1)])
+        await store.restore(None, "s1", popped)
+        return await store.pop(None, "s1")
+
+    cart_items, _ = asyncio.run(run())
+    assert [(i["item"], i["quantity"]) for i in cart_items] == [("dal", 1), ("naan", 5), ("lassi", 1)]
+
+
+def test_redis_concurrent_merges_keep_every_line():
+    store = make_store("redis")
+
+    async def run():
+        await asyncio.gather(*(store.merge_lines(None, "s1", [line(f"item {n}")]) for n in range(50)))
+        return await store.pop(None, "s1")
+
+    cart_items, total = asyncio.run(run())
+    assert sorted(i["item"] for i in cart_items) == sorted(f"item {n}" for n in range(50))
+    assert total == 5000
+
+
+def test_redis_pop_takes_the_cart_once():
+    store = make_store("redis")
+
+    async def run():
+        await store.merge_lines(None, "s1", [line("kulfi", 3)])
+        return await asyncio.gather(*(store.pop(None, "s1") for _ in range(10)))
+
+    popped = [p for p in asyncio.run(run()) if p is not None]
+    assert len(popped) == 1
+    assert popped[0][0][0]["quantity"] == 3
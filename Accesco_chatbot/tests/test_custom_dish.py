@@ -0,0 +1,67 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from Accesco_chatbot.app.services.ingredient_pricing import CustomDish, IngredientEntry
+
+
+@pytest.fixture(scope="module")
+def prices() -> dict:
+    rnd = random.Random(7)
+    return {
+        f"ingredient {i}": IngredientEntry(
+            f"ingredient {i}", f"Ingredient {i}", Decimal(rnd.randint(100, 9999)) / 100, None)
+        for i in range(1000)
+    }
+
+
+def reference(turns: list, prices: dict) -> tuple:
+    """Every distinct known ingredient in first-asked order, each charged once."""
+    seen = []
+    for names in turns:
+        for name in names:
+            if name in prices and name not in seen:
+                seen.append(name)
+    return seen, sum((prices[name].price for name in seen), Decimal("0"))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_repeated_merges_match_pricing_from_scratch(prices, seed):
+    """
+    Random "create-custom-food" turns, with repeats inside and across turns
+    and unknown ingredients, round-tripped through the cart line between
+    turns as the handler does.
+    """
+    rnd = random.Random(seed)
+    names = list(prices)
+    for _ in range(100):
+        turns = []
+        line = None
+        for _ in range(rnd.randint(1, 12)):
+            # Draw from a small pool so repeats are common
+            pool = rnd.sample(names, 8) + ["not an ingredient"]
+            turn = [rnd.choice(pool) for _ in range(rnd.randint(1, 6))]
+            turns.append(turn)
+
+            dish = CustomDish.from_line(line) if line is not None else CustomDish()
+            before = dish.price
+            added = dish.add(prices[n] for n in turn if n in prices)
+            assert dish.price - before == sum((e.price for e in added), Decimal("0"))
+            assert len({e.key for e in added}) == len(added)
+
+            line = {"item": "custom dish", "quantity": 1, "customization": None,
+                    "ingredients": dish.ingredients,
+                    "unit_price": float(dish.price), "total_price": float(dish.price)}
+
+            expected_names, expected_price = reference(turns, prices)
+            assert line["ingredients"] == expected_names
+            assert Decimal(str(line["unit_price"])) == expected_price
+
+
+def test_legacy_line_repeats_are_folded_not_recharged(prices):
+    a, b, c = list(prices)[:3]
+    dish = CustomDish.from_line({"ingredients": [a, b, a], "unit_price": 12.5})
+    dish.add([prices[b], prices[c]])
+    assert dish.ingredients == [a, b, c]
+    assert dish.price == Decimal("12.5") + prices[c].price
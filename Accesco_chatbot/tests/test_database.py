@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from Accesco_chatbot.app import database
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def close(self):
+        self.engine.open -= 1
+
+
+class FakeAsyncEngine:
+    """Hands out connections; the `fail_at`-th connect raises."""
+
+    pool = object()
+
+    def __init__(self, fail_at: int = None):
+        self.fail_at = fail_at
+        self.attempts = 0
+        self.open = 0
+
+    async def connect(self):
+        self.attempts += 1
+        attempt = self.attempts
+        await asyncio.sleep(0)
+        if attempt == self.fail_at:
+            raise ConnectionRefusedError("too many clients")
+        self.open += 1
+        return FakeConnection(self)
+
+
+def test_warm_async_pool_opens_and_returns_connections(monkeypatch):
+    engine = FakeAsyncEngine()
+    monkeypatch.setattr(database, "async_engine", engine)
+    assert asyncio.run(database.warm_async_pool(size=3)) == 3
+    assert engine.open == 0
+
+
+def test_warm_async_pool_closes_connections_when_one_fails(monkeypatch):
+    engine = FakeAsyncEngine(fail_at=2)
+    monkeypatch.setattr(database, "async_engine", engine)
+    with pytest.raises(ConnectionRefusedError):
+        asyncio.run(database.warm_async_pool(size=4))
+    assert engine.attempts == 4
+    assert engine.open == 0
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import random
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from Accesco_chatbot.app import database
+from Accesco_chatbot.app.main import app
+from Accesco_chatbot.app.models.orders import Orders
+from Accesco_chatbot.benchmarks import payloads
+from Accesco_chatbot.benchmarks.bench_pool import seed
+
+pytestmark = pytest.mark.postgres
+
+SESSIONS = 30
+COPIES = 5
+
+
+async def deliver(client: httpx.AsyncClient, body: dict) -> dict:
+    """Sends COPIES concurrent deliveries plus one late retry; all must get the same answer."""
+    responses = await asyncio.gather(*(client.post("/webhook", json=body) for _ in range(COPIES)))
+    responses.append(await client.post("/webhook", json=body))
+    assert all(r.status_code == 200 for r in responses)
+    answers = {json.dumps(r.json(), sort_keys=True) for r in responses}
+    assert len(answers) == 1, body["queryResult"]["intent"]["displayName"]
+    return responses[0].json()
+
+
+async def conversation(client: httpx.AsyncClient, rnd: random.Random) -> tuple:
+    sid = f"idem-{uuid.uuid4().hex}"
+    adds = [rnd.randint(1, 3) for _ in range(rnd.randint(1, 3))]
+    for qty in adds:
+        await deliver(client, payloads.add_item(sid, payloads.SWADISHT, ["bench paneer"], [qty]))
+    reply = await deliver(client, payloads.confirm(sid, payloads.SWADISHT))
+    # Re-adding an item replaces its line, so the last quantity is what counts
+    return sid, adds[-1], payloads.order_id_from(reply)
+
+
+async def run() -> list:
+    rnd = random.Random(1)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://idem") as client:
+        results = await asyncio.gather(*(
+            conversation(client, random.Random(rnd.random())) for _ in range(SESSIONS)
+        ))
+
+    found = []
+    async with database.AsyncSessionLocal() as db:
+        for sid, expected_qty, order_id in results:
+            orders = (await db.execute(select(Orders).where(Orders.session_id == sid))).scalars().all()
+            found.append((
+                [o.order_id for o in orders],
+                order_id,
+                sum(line["quantity"] for o in orders for line in o.items),
+                expected_qty,
+            ))
+    return found
+
+
+def test_duplicate_deliveries_replay_first_answer(app_db, pg_engine):
+    seed(pg_engine)
+    for order_ids, order_id, qty, expected_qty in asyncio.run(run()):
+        assert order_ids == [order_id]
+        assert qty == expected_qty
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from Accesco_chatbot.app.utils import metrics
+
+
+def test_failed_statements_leave_nothing_on_the_connection():
+    # One pooled connection, reused by every checkout
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    metrics.instrument_engine(engine)
+    record = metrics.RequestMetrics()
+    token = metrics.current_request.set(record)
+    try:
+        with engine.connect() as conn:
+            info = dict(conn.info)
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert dict(conn.info) == info
+    finally:
+        metrics.current_request.reset(token)
+        engine.dispose()
+
+    assert record.queries == 1
+    assert record.db_seconds > 0
@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from Accesco_chatbot.app import database
+from Accesco_chatbot.app.models.orders import Orders
+from Accesco_chatbot.app.services import order_service
+from Accesco_chatbot.app.services.cart_store import PostgresCartStore
+from Accesco_chatbot.app.utils.extract import DialogflowRequest
+from Accesco_chatbot.app.utils.ids import ALPHABET, MAX_NODE, PREFIX, OrderIdGenerator, normalize_order_id
+from Accesco_chatbot.benchmarks import payloads
+
+
+def frozen_clock():
+    return 1_790_000_000.0
+
+
+def test_ids_increase_and_normalize():
+    gen = OrderIdGenerator(node=MAX_NODE)
+    ids = [gen.new() for _ in range(10_000)]
+    assert ids == sorted(set(ids))
+    assert all(normalize_order_id(i) == i for i in ids)
+    assert normalize_order_id(ids[0].lower().replace("1", "l").replace("0", "o")) == ids[0]
+
+
+def test_legacy_and_malformed_ids():
+    for legacy in [str(uuid.uuid4())[:10].upper(), f"EX{uuid.uuid4().hex[:8].upper()}"]:
+        assert normalize_order_id(legacy) == legacy
+    for bad in ["", "EX", "EX123", f"{PREFIX}{ALPHABET[:12]}U", "DROP TABLE orders", "3FAA3204_8"]:
+        assert normalize_order_id(bad) is None
+
+
+def test_generators_sharing_a_node_collide():
+    # Why a duplicate order_id must be handled: same node, same millisecond
+    a, b = OrderIdGenerator(node=7, clock=frozen_clock), OrderIdGenerator(node=7, clock=frozen_clock)
+    assert {a.new() for _ in range(100)} & {b.new() for _ in range(100)}
+
+    c, d = OrderIdGenerator(node=7, clock=frozen_clock), OrderIdGenerator(node=8, clock=frozen_clock)
+    assert not {c.new() for _ in range(5000)} & {d.new() for _ in range(5000)}
+
+
+def _confirm_with_ids(monkeypatch, ids) -> tuple:
+    """Confirms a one-line Postgres cart while generate_order_id hands out `ids`."""
+    session_id = uuid.uuid4().hex
+    store = PostgresCartStore()
+    monkeypatch.setattr(order_service, "cart_store", store)
+    drawn = iter(ids)
+    monkeypatch.setattr(order_service, "generate_order_id", lambda: next(drawn))
+    req = DialogflowRequest.from_body(payloads.confirm(session_id, payloads.SWADISHT))
+
+    async def run():
+        async with database.AsyncSessionLocal() as db:
+            await store.merge_lines(db, session_id, [order_service.cart_line("dal", 2, None, 80)])
+            await db.commit()
+        async with database.AsyncSessionLocal() as db:
+            try:
+                reply = await order_service.handle_confirm_order(req, db, "Swadisht")
+            except IntegrityError as e:
+                reply = e
+        async with database.AsyncSessionLocal() as db:
+            orders = (await db.execute(
+                select(Orders.order_id).where(Orders.session_id == session_id))).scalars().all()
+            cart = await store.pop(db, session_id)
+            await db.rollback()
+        return reply, orders, cart
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def taken_id(app_db):
+    order_id = OrderIdGenerator(node=3).new()
+
+    async def insert():
+        async with database.AsyncSessionLocal() as db:
+            db.add(Orders(order_id=order_id, platform="Swadisht", session_id="other", items=[],
+                          price=0, status="confirmed", created_at=datetime.utcnow()))
+            await db.commit()
+
+    asyncio.run(insert())
+    return order_id
+
+
+@pytest.mark.postgres
+def test_confirm_draws_a_new_id_on_collision(monkeypatch, taken_id):
+    fresh = OrderIdGenerator(node=4).new()
+    reply, orders, cart = _confirm_with_ids(monkeypatch, [taken_id, fresh])
+    assert f"Order ID: {fresh}" in reply["fulfillmentText"]
+    assert orders == [fresh]
+    assert cart is None
+
+
+@pytest.mark.postgres
+def test_confirm_keeps_the_cart_when_every_id_is_taken(monkeypatch, taken_id):
+    reply, orders, cart = _confirm_with_ids(monkeypatch, [taken_id] * order_service.ORDER_ID_ATTEMPTS)
+    assert isinstance(reply, IntegrityError)
+    assert orders == []
+    assert [line["item"] for line in cart[0]] == ["dal"]
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from Accesco_chatbot.app.services.order_status import OrderStatusCache
+
+ORDER_ID = "EX0000000000001"
+
+
+class SlowSession:
+    """Answers the order query with a row read now, once `release` is set."""
+
+    def __init__(self, status: str):
+        self.row = SimpleNamespace(order_id=ORDER_ID, status=status, created_at=datetime(2026, 1, 1),
+                                   items=[{"item": "paneer tikka", "quantity": 1}])
+        self.querying = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def execute(self, statement):
+        row = self.row
+        self.querying.set()
+        await self.release.wait()
+        return SimpleNamespace(first=lambda: row)
+
+
+async def miss_racing(cache: OrderStatusCache, change) -> tuple:
+    db = SlowSession("confirmed")
+    miss = asyncio.create_task(cache.get(db, ORDER_ID))
+    await db.querying.wait()
+    # The cancel commits and updates the cache while the miss is querying
+    change()
+    db.release.set()
+    first = await miss
+    second = await cache.get(db, ORDER_ID)
+    return first, second
+
+
+def test_cancel_during_miss_is_not_overwritten():
+    cache = OrderStatusCache(ttl=60, max_entries=100)
+    first, second = asyncio.run(miss_racing(cache, lambda: cache.set_status(ORDER_ID, "cancelled")))
+    assert first.status == "cancelled"
+    assert second.status == "cancelled"
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not cache._changed
+
+
+@pytest.mark.parametrize("order_id", [ORDER_ID, None])
+def test_invalidate_during_miss_caches_nothing(order_id):
+    cache = OrderStatusCache(ttl=60, max_entries=100)
+    asyncio.run(miss_racing(cache, lambda: cache.invalidate(order_id)))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_change_before_miss_does_not_affect_it():
+    cache = OrderStatusCache(ttl=60, max_entries=100)
+    cache.set_status(ORDER_ID, "cancelled")
+
+    async def scenario():
+        db = SlowSession("cancelled")
+        db.release.set()
+        await cache.get(db, ORDER_ID)
+        return await cache.get(db, ORDER_ID)
+
+    assert asyncio.run(scenario()).status == "cancelled"
+    assert (cache.hits, cache.misses) == (1, 1)
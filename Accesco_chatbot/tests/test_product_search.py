@@ -0,0 +1,49 @@
+import time
+
+from Accesco_chatbot.app.services.catalog_service import ProductEntry
+from Accesco_chatbot.app.services.product_search import FuzzyProductIndex, escape_like
+
+BASES = ["paneer", "chicken", "biryani", "masala", "butter", "tikka",
+         "kebab", "naan", "curry", "korma", "tandoori", "kulfi"]
+
+
+def make_index() -> FuzzyProductIndex:
+    # Three close spellings per word, so every misspelt query word has
+    # max_alternatives matches
+    names = []
+    for base in BASES:
+        names += [base, f"{base}s", f"{base}z"]
+    names += [f"{a} {b}" for a, b in zip(BASES, BASES[1:])]
+    return FuzzyProductIndex([ProductEntry(name, 100.0, True, None) for name in names])
+
+
+def test_misspelt_word_matches():
+    index = make_index()
+    assert index.search("panner chiken")[0][1].name == "paneer chicken"
+
+
+def test_long_query_is_bounded(monkeypatch):
+    index = make_index()
+    calls = []
+    take = index._take
+    monkeypatch.setattr(index, "_take", lambda *a: calls.append(a) or take(*a))
+
+    # 3 alternatives for each of 40 words: 3^40 combinations unbounded
+    query = " ".join(base[:-1] + "q" for base in BASES * 4)
+    assert all(len(index.match_word(w)) == 3 for w in query.split())
+
+    start = time.perf_counter()
+    index.search(query)
+    assert time.perf_counter() - start < 0.1
+    assert len(calls) <= 2 * index.max_combos
+    assert all(len(words) <= index.max_query_words for words, *_ in calls)
+
+
+def test_beam_keeps_best_combinations():
+    index = make_index()
+    index.max_combos = 1
+    assert index.search("paneer chicken")[0][1].name == "paneer chicken"
+
+
+def test_escape_like():
+    assert escape_like("50% off_now\\") == "50\\% off\\_now\\\\"
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from Accesco_chatbot.app import database
+from Accesco_chatbot.app.main import app
+from Accesco_chatbot.app.models.products import Products
+from Accesco_chatbot.app.services.catalog_service import catalog
+from Accesco_chatbot.benchmarks import payloads
+
+pytestmark = pytest.mark.postgres
+
+CART_SIZES = (1, 10, 50)
+
+
+@pytest.fixture
+def products(pg_engine):
+    names = [f"qc item {i}" for i in range(max(CART_SIZES))]
+    with database.SessionLocal(bind=pg_engine) as db:
+        existing = {name for (name,) in db.query(Products.name).filter(Products.name.in_(names))}
+        db.add_all(
+            Products(name=name, price=10.0 + i, available=True, image_url=f"https://example.com/{i}.png")
+            for i, name in enumerate(names) if name not in existing
+        )
+        db.commit()
+    return names
+
+
+def measure(client, counter: list, names: list) -> dict:
+    session = uuid.uuid4().hex
+    counts = {}
+
+    counter[0] = 0
+    client.post("/webhook", json=payloads.add_item(
+        session, payloads.SWADISHT, names, [1] * len(names))).raise_for_status()
+    counts["add_item"] = counter[0]
+
+    counter[0] = 0
+    client.post("/webhook", json=payloads.confirm(session, payloads.SWADISHT)).raise_for_status()
+    counts["confirm"] = counter[0]
+    return counts
+
+
+@pytest.mark.parametrize("cache_ttl", [0, 300])
+def test_statement_count_independent_of_cart_size(app_db, products, monkeypatch, cache_ttl):
+    monkeypatch.setattr(catalog, "ttl", cache_ttl)
+    catalog.invalidate()
+
+    counter = [0]
+
+    @event.listens_for(app_db.sync_engine, "before_cursor_execute")
+    def _count(*_):
+        counter[0] += 1
+
+    with TestClient(app) as client:
+        # The first call after invalidation pays the catalog load
+        measure(client, counter, products[:1])
+        per_size = {size: measure(client, counter, products[:size]) for size in CART_SIZES}
+    catalog.invalidate()
+
+    assert len({tuple(c.values()) for c in per_size.values()}) == 1, per_size
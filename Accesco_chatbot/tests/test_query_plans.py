@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from Accesco_chatbot.app.config import settings
+
+pytestmark = pytest.mark.postgres
+
+SEED_SQL = [
+    """INSERT INTO products (name, price, available, image_url)
+       SELECT 'product ' || g, 10 + g % 500, g % 7 <> 0, NULL FROM generate_series(1, 20000) g""",
+    """INSERT INTO ingredients (name, price)
+       SELECT 'ingredient ' || g, 1 + g % 50 FROM generate_series(1, 5000) g""",
+    """INSERT INTO orders (order_id, platform, session_id, items, status, created_at, price)
+       SELECT 'ORD' || g, 'Swadisht', 'session-' || g, '[]', 'confirmed', now(), 100
+       FROM generate_series(1, 50000) g""",
+    """INSERT INTO cancel_feedback (order_id, feedback, created_at)
+       SELECT 'ORD' || g, 'late', now() FROM generate_series(1, 20000) g""",
+    """INSERT INTO temp_cart (session_id, cart_items, total_price, status, updated_at)
+       SELECT 'cart-' || g, '[]', 0, 'ACTIVE', now() - (g || ' minutes')::interval
+       FROM generate_series(1, 50000) g""",
+]
+
+# (name, table that must not be seq-scanned, query)
+HOT_QUERIES = [
+    ("cart lookup / pop", "temp_cart",
+     "SELECT * FROM temp_cart WHERE session_id = 'cart-42' AND status = 'ACTIVE'"),
+    ("cart sweep", "temp_cart",
+     "SELECT id FROM temp_cart WHERE updated_at < now() - interval '1 day' "
+     "ORDER BY updated_at LIMIT 1000"),
+    ("product batch lookup", "products",
+     "SELECT * FROM products WHERE name IN ('product 1', 'product 2', 'product 3') "
+     "AND available = true"),
+    ("ingredient lookup", "ingredients",
+     "SELECT * FROM ingredients WHERE name IN ('ingredient 1', 'ingredient 9')"),
+    ("order by order_id", "orders",
+     "SELECT * FROM orders WHERE order_id = 'ORD4242'"),
+    ("feedback by order_id", "cancel_feedback",
+     "SELECT * FROM cancel_feedback WHERE order_id = 'ORD4242'"),
+]
+
+TRGM_QUERY = ("product ILIKE search", "products", "SELECT * FROM products WHERE name ILIKE '%uct 1234%'")
+
+
+def seq_scans(plan: dict, table: str) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == table:
+        found.append(plan)
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child, table))
+    return found
+
+
+@pytest.fixture(scope="module")
+def planner(scratch_url):
+    # Its own database: the seed data would otherwise fill the shared one
+    engine = create_engine(scratch_url.replace("postgresql://", "postgresql+psycopg2://"),
+                           connect_args={"sslmode": settings.DB_SSLMODE})
+    with engine.begin() as conn:
+        for sql in SEED_SQL:
+            conn.execute(text(sql))
+        conn.execute(text("ANALYZE"))
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def plan_of(conn, sql: str) -> dict:
+    return conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+
+
+@pytest.mark.parametrize("name, table, sql", HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+def test_hot_path_uses_an_index(planner, name, table, sql):
+    assert seq_scans(plan_of(planner, sql), table) == []
+
+
+def test_product_ilike_uses_trigram_index(planner):
+    if not planner.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar():
+        pytest.skip("pg_trgm not available")
+    name, table, sql = TRGM_QUERY
+    assert seq_scans(plan_of(planner, sql), table) == []
@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from Accesco_chatbot.app.models.cancel_feedback import Cancel_Feedback
+from Accesco_chatbot.app.services import write_behind as write_behind_module
+from Accesco_chatbot.app.services.write_behind import WriteBehindBuffer
+
+TABLE = Cancel_Feedback.__table__
+
+
+def feedback(order_id: str) -> dict:
+    return {"order_id": order_id, "feedback": "changed my mind", "created_at": datetime.utcnow()}
+
+
+async def fill_and_flush(buffer: WriteBehindBuffer, rows) -> int:
+    for row in rows:
+        buffer.add(TABLE, row)
+    written = await buffer.flush()
+    await buffer.stop()
+    return written
+
+
+@pytest.mark.postgres
+def test_bad_row_does_not_block_its_table(app_db, pg_engine):
+    good = [f"WB-GOOD-{i}" for i in range(5)]
+    rows = [feedback(i) for i in good[:2]] + [feedback("X" * 60)] + [feedback(i) for i in good[2:]]
+    buffer = WriteBehindBuffer(batch_size=100, interval=60, max_queue=100)
+
+    written = asyncio.run(fill_and_flush(buffer, rows))
+    assert written == 5
+    assert buffer.depth == 0
+    assert buffer.rejected == 1
+
+    with pg_engine.connect() as conn:
+        stored = conn.execute(
+            text("SELECT order_id FROM cancel_feedback WHERE order_id LIKE 'WB-GOOD-%' ORDER BY id")
+        ).scalars().all()
+    assert stored == good
+
+
+class DownSession:
+    async def __aenter__(self):
+        raise OperationalError("INSERT", {}, ConnectionRefusedError("server is down"))
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_rows_stay_queued_while_the_database_is_down(monkeypatch):
+    monkeypatch.setattr(write_behind_module, "AsyncSessionLocal", DownSession)
+    buffer = WriteBehindBuffer(batch_size=2, interval=60, max_queue=100)
+    rows = [feedback(f"WB-DOWN-{i}") for i in range(5)]
+
+    async def scenario():
+        for row in rows:
+            buffer.add(TABLE, row)
+        written = await buffer.flush()
+        buffer.add(TABLE, feedback("WB-LATER"))
+        await buffer.stop()
+        return written
+
+    assert asyncio.run(scenario()) == 0
+    assert buffer.rejected == 0
+    assert buffer.depth == 6
+    assert [r["order_id"] for r in buffer._rows[TABLE]] == [f"WB-DOWN-{i}" for i in range(5)] + ["WB-LATER"]